@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for LinkedInBot against the offline mock site.
+Runs the real bot headless, reports login time, time to first Connect,
+requests per minute, p50/p95 per wait step and the browser's memory and
+CPU footprint, and stores the results under bench_results/ so runs can
+be compared between commits.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import time
+
+from log_setup import configure_logging
+from metrics import percentile
+from mock_site import MockLinkedIn
+from rate_governor import UNLIMITED
+
+RESULTS_DIR = "bench_results"
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def run_once(site, num_requests, include_note, query, lean=False):
+    """Run one cold start + search_and_connect pass and return its measurements"""
+    from linkedin_bot import LinkedInBot
+
+    site.reset()
+    # index_file, budget_file and checkpoint_file of None keep all state in memory so every run
+    # starts clean and nothing is left for a real run to pick up
+    bot = LinkedInBot(update_status_callback=lambda msg: None, base_url=site.base_url, headless=True,
+                      index_file=None, lean=lean, budget_file=None, checkpoint_file=None,
+                      rate_limits=UNLIMITED)
+    try:
+        start = time.monotonic()
+        if not bot.initialize_driver():
+            raise RuntimeError("could not start Chrome")
+        driver_init = time.monotonic() - start
+
+        if not bot.start_session("bench@example.com", "benchmark"):
+            raise RuntimeError("login against the mock site failed")
+        login = time.monotonic() - start - driver_init
+
+        search_started = time.time()
+        bot.search_and_connect(query, num_requests, include_note, "Hi, benchmarking!")
+        search_seconds = time.time() - search_started
+
+        footprint = bot.browser_footprint() or {}
+        invites = list(site.invites)
+        first_connect = invites[0]["time"] - search_started if invites else None
+        return {
+            "driver_init_s": driver_init,
+            "login_s": login,
+            "time_to_first_connect_s": first_connect,
+            "search_and_connect_s": search_seconds,
+            "sent": len(invites),
+            "requests_per_minute": len(invites) / search_seconds * 60 if search_seconds else 0.0,
+            "rss_mb": footprint.get("rss_mb"),
+            "cpu_seconds": footprint.get("cpu_seconds"),
+            "wait_samples": {step: list(entry["samples"]) for step, entry in bot.waits.timings.items()},
+        }
+    finally:
+        bot.close()
+
+
+def summarize(runs):
+    """Aggregate per-run measurements into one report"""
+    def stats(values):
+        values = [v for v in values if v is not None]
+        return {"p50": percentile(values, 50), "p95": percentile(values, 95), "n": len(values)}
+
+    steps = {}
+    for run in runs:
+        for step, samples in run["wait_samples"].items():
+            steps.setdefault(step, []).extend(samples)
+
+    return {
+        "driver_init_s": stats([r["driver_init_s"] for r in runs]),
+        "login_s": stats([r["login_s"] for r in runs]),
+        "time_to_first_connect_s": stats([r["time_to_first_connect_s"] for r in runs]),
+        "requests_per_minute": stats([r["requests_per_minute"] for r in runs]),
+        "rss_mb": stats([r["rss_mb"] for r in runs]),
+        "cpu_seconds": stats([r["cpu_seconds"] for r in runs]),
+        "sent": sum(r["sent"] for r in runs),
+        "steps": {step: stats(samples) for step, samples in sorted(steps.items())},
+    }
+
+
+def print_report(summary, previous=None):
+    def line(name, current, before):
+        delta = ""
+        if before:
+            diff = current["p50"] - before["p50"]
+            delta = f"  ({diff:+.3f} vs previous)"
+        print(f"  {name:<26} p50 {current['p50']:8.3f}  p95 {current['p95']:8.3f}{delta}")
+
+    previous = previous or {}
+    print("Run metrics:")
+    for key in ("driver_init_s", "login_s", "time_to_first_connect_s", "requests_per_minute",
+                "rss_mb", "cpu_seconds"):
+        if key in summary:
+            line(key, summary[key], previous.get(key))
+    print("Wait steps (seconds):")
+    for step, stats in summary["steps"].items():
+        line(step, stats, previous.get("steps", {}).get(step))
+
+
+def latest_result():
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), key=os.path.getmtime)
+    return files[-1] if files else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LinkedInBot against the mock site")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--note", action="store_true", help="include a note with each request")
+    parser.add_argument("--query", default="data engineer")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--ui-latency", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--mode", choices=("default", "lean", "both"), default="default",
+                        help="browser mode to benchmark; 'both' reports them side by side")
+    parser.add_argument("--compare", help="result file to compare against (default: latest stored)")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+    configure_logging({"file": None})
+
+    site = MockLinkedIn(latency=args.latency, ui_latency=args.ui_latency, failure_rate=args.failure_rate)
+    site.start()
+    modes = ("default", "lean") if args.mode == "both" else (args.mode,)
+    summaries = {}
+    try:
+        for mode in modes:
+            runs = [run_once(site, args.requests, args.note, args.query, lean=(mode == "lean"))
+                    for _ in range(args.runs)]
+            summaries[mode] = summarize(runs)
+    finally:
+        site.stop()
+
+    result = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "modes": summaries,
+    }
+
+    previous = {}
+    compare_path = args.compare or latest_result()
+    if compare_path and os.path.exists(compare_path):
+        with open(compare_path, "r") as f:
+            stored = json.load(f)
+        # Results stored before browser modes existed hold a single default summary
+        previous = stored.get("modes") or {"default": stored.get("summary")}
+        print(f"Comparing against {compare_path}")
+
+    for mode, summary in summaries.items():
+        print(f"=== {mode} mode ===")
+        print_report(summary, previous.get(mode))
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{result['revision']}.json")
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
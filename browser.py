@@ -0,0 +1,101 @@
+from selenium import webdriver
+import os
+
+# Requests the bot never reads. Blocked through CDP in lean mode.
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*media.licdn.com*",
+]
+LEAN_WINDOW_SIZE = "1024,768"
+
+
+def build_chrome_options(profile_dir=None, headless=False, lean=False):
+    """Return ChromeOptions for the requested mode"""
+    options = webdriver.ChromeOptions()
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    if headless or lean:
+        options.add_argument("--headless=new")
+    if lean:
+        # Hand control back once the DOM is parsed; the bot waits on elements anyway
+        options.page_load_strategy = "eager"
+        options.add_argument(f"--window-size={LEAN_WINDOW_SIZE}")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-component-update")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-gpu")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+        })
+    return options
+
+
+def apply_lean_blocking(driver):
+    """Block image, media and font requests for the whole session"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+
+
+def _children(pid):
+    """Direct child pids of pid, read from /proc"""
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    try:
+        for tid in os.listdir(task_dir):
+            with open(f"{task_dir}/{tid}/children", "r") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def process_tree(root_pid):
+    """root_pid and all of its descendants"""
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(_children(pid))
+    return pids
+
+
+def process_stats(pid):
+    """Resident memory (bytes) and CPU time (seconds) of one process, or None"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # The command name may contain spaces, so split after its closing paren
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm", "r") as f:
+            rss_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    cpu = (int(fields[11]) + int(fields[12])) / ticks
+    return {"rss": rss_pages * os.sysconf("SC_PAGE_SIZE"), "cpu": cpu}
+
+
+def browser_footprint(driver):
+    """Total RSS (MB) and CPU seconds of chromedriver and every Chrome process it started"""
+    try:
+        root_pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    if not os.path.exists(f"/proc/{root_pid}"):
+        return None
+
+    rss, cpu, count = 0, 0.0, 0
+    for pid in process_tree(root_pid):
+        stats = process_stats(pid)
+        if stats:
+            rss += stats["rss"]
+            cpu += stats["cpu"]
+            count += 1
+    return {"rss_mb": rss / (1024 * 1024), "cpu_seconds": cpu, "processes": count}
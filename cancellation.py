@@ -0,0 +1,32 @@
+import threading
+
+
+class Cancelled(Exception):
+    """Raised inside a wait or sleep when the run has been stopped"""
+
+
+class CancellationToken:
+    def __init__(self):
+        """Shared stop signal checked by every wait and sleep in a run"""
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def reset(self):
+        self._event.clear()
+
+    def check(self):
+        """Raise Cancelled if the token has been cancelled"""
+        if self._event.is_set():
+            raise Cancelled()
+
+    def sleep(self, seconds):
+        """Sleep for up to seconds, raising Cancelled as soon as the token is cancelled"""
+        if seconds > 0 and self._event.wait(seconds):
+            raise Cancelled()
+        self.check()
@@ -0,0 +1,60 @@
+import csv
+import json
+import os
+import re
+
+EXPORT_DIR = "exports"
+EXPORT_FIELDS = ("profile_id", "name", "headline", "location", "button_state", "page")
+FORMATS = ("jsonl", "csv")
+
+
+def export_path(export_dir, search_query, fmt="jsonl", job=None):
+    """A file name for one search's export, e.g. exports/data-engineer-berlin.jsonl.
+    Pass the job's index to keep searches that share a slug from overwriting
+    each other, e.g. exports/003-data-engineer-berlin.jsonl."""
+    slug = re.sub(r"[^a-z0-9]+", "-", search_query.lower()).strip("-") or "search"
+    if job is not None:
+        slug = f"{job:03d}-{slug}"
+    return os.path.join(export_dir, f"{slug}.{fmt}")
+
+
+class CardExporter:
+    def __init__(self, path, fmt=None):
+        """Stream result cards to a JSONL or CSV file as they are found. The
+        format follows the file extension unless fmt is given; nothing is
+        kept in memory beyond the current row."""
+        self.path = path
+        self.format = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown export format '{self.format}', expected one of {', '.join(FORMATS)}")
+        self.rows = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, card, page):
+        row = {field: card.get(field, "") for field in EXPORT_FIELDS}
+        row["page"] = page
+        if self._csv:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+    def flush(self):
+        """Push buffered rows to disk, e.g. once per results page"""
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,53 @@
+from urllib.parse import urlparse, parse_qs
+import json
+import os
+import time
+
+CHECKPOINT_FILE = "linkedin_checkpoint.json"
+
+
+def page_from_url(url):
+    """Results page number encoded in a search URL, defaulting to 1"""
+    try:
+        return int(parse_qs(urlparse(url).query).get("page", ["1"])[0])
+    except (ValueError, TypeError):
+        return 1
+
+
+class Checkpoint:
+    def __init__(self, path=CHECKPOINT_FILE):
+        """Progress of the current search_and_connect run, rewritten after every action"""
+        self.path = path
+
+    def load(self):
+        """Return the saved state, or None if there is nothing to resume"""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, search_query, num_requests, requests_sent, results_url, last_profile_id=None):
+        """Atomically replace the checkpoint so a crash never leaves half a file"""
+        if not self.path:
+            return
+        state = {
+            "search_query": search_query,
+            "num_requests": num_requests,
+            "requests_sent": requests_sent,
+            "results_url": results_url,
+            "page": page_from_url(results_url),
+            "last_profile_id": last_profile_id,
+            "updated": time.time(),
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Forget the checkpoint once a run completes"""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Headless batch runner for the LinkedIn Automation Tool.
+
+Reads a JSONL job file, one job per line:
+
+    {"search_query": "data engineer berlin", "count": 10, "note": "Hi, I'd like to connect!"}
+
+and runs the jobs in order on a single long-lived LinkedInBot. Progress is
+streamed to stdout as JSON lines and a machine-readable summary is printed
+on exit. Credentials come from LINKEDIN_EMAIL / LINKEDIN_PASSWORD; a saved
+browser session is reused when possible.
+
+With --dry-run nothing is clicked: each job's search results are walked
+and every card is exported to --export-dir, and the job records report
+candidates per page, pages per minute and an estimate of how many pages
+and minutes of walking the job's count needs.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+from card_export import EXPORT_DIR, FORMATS, export_path
+from contacts import INDEX_FILE
+
+PROFILE_DIR = "chrome_profile"
+COOKIE_FILE = "linkedin_cookies.json"
+DEFAULT_COUNT = 10
+
+EXIT_OK = 0
+EXIT_JOB_FAILED = 1
+EXIT_SETUP_FAILED = 2
+
+
+def emit(event, **fields):
+    """Write one JSON progress record to stdout"""
+    record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "event": event}
+    record.update(fields)
+    print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def load_jobs(path):
+    """Parse and validate the job file, raising ValueError on bad lines"""
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"line {line_number}: invalid JSON ({e})")
+            if not isinstance(job, dict) or not job.get("search_query"):
+                raise ValueError(f"line {line_number}: 'search_query' is required")
+            count = job.get("count", DEFAULT_COUNT)
+            if not isinstance(count, int) or count <= 0:
+                raise ValueError(f"line {line_number}: 'count' must be a positive integer")
+            filters = job.get("filters") or {}
+            if not isinstance(filters, dict):
+                raise ValueError(f"line {line_number}: 'filters' must be an object")
+            jobs.append({
+                "search_query": job["search_query"],
+                "count": count,
+                "note": job.get("note", ""),
+                "filters": filters,
+            })
+    return jobs
+
+
+def load_settings(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run_dry_job(bot, index, job, args):
+    """Export one job's result cards and emit its sizing report; returns the job record"""
+    job_started = time.monotonic()
+    path = export_path(args.export_dir, job["search_query"], args.export_format, job=index)
+    ok = bot.dry_run(job["search_query"], path, max_pages=args.max_pages, filters=job["filters"],
+                     export_format=args.export_format)
+    report = dict(bot.last_dry_run or {}) if ok else {}
+    if report.get("candidates_per_page") and report.get("pages_per_minute"):
+        pages = math.ceil(job["count"] / report["candidates_per_page"])
+        report["estimated_pages"] = pages
+        report["estimated_walk_minutes"] = round(pages / report["pages_per_minute"], 1)
+    result = {
+        "job": index,
+        "search_query": job["search_query"],
+        "requested": job["count"],
+        "ok": ok,
+        "dry_run": True,
+        "seconds": round(time.monotonic() - job_started, 2),
+        "metrics_run_id": (bot.last_run_summary or {}).get("run_id"),
+        **report,
+    }
+    emit("job_finished", **result)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run LinkedIn automation jobs without a display")
+    parser.add_argument("job_file", help="JSONL file with one job per line")
+    parser.add_argument("--email", default=os.environ.get("LINKEDIN_EMAIL", ""))
+    parser.add_argument("--settings", default="linkedin_settings.json", help="settings file shared with the GUI")
+    parser.add_argument("--no-lean", action="store_true", help="use the default browser profile instead of lean mode")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted job from its checkpoint")
+    parser.add_argument("--telemetry", action="store_true", help="record DevTools page metrics with the run metrics")
+    parser.add_argument("--profile", nargs="?", type=float, const=0.0, metavar="SECONDS",
+                        help="profile each job (optionally only its first SECONDS) next to its run metrics")
+    parser.add_argument("--no-session", action="store_true", help="do not reuse or save a browser session")
+    parser.add_argument("--dry-run", action="store_true", help="export each job's result cards instead of connecting")
+    parser.add_argument("--export-dir", default=EXPORT_DIR, help="where --dry-run writes one file per job")
+    parser.add_argument("--export-format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--max-pages", type=int, help="stop a dry run after this many result pages")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.job_file)
+    except (OSError, ValueError) as e:
+        emit("error", message=f"Could not read job file: {e}")
+        return EXIT_SETUP_FAILED
+
+    from linkedin_bot import LinkedInBot
+
+    settings = load_settings(args.settings)
+    from log_setup import configure_logging
+    configure_logging(settings.get("logging"))
+    bot = LinkedInBot(
+        update_status_callback=lambda message: emit("status", message=message),
+        timeouts=settings.get("timeouts"),
+        profile_dir=None if args.no_session else settings.get("profile_dir", PROFILE_DIR),
+        cookie_file=None if args.no_session else settings.get("cookie_file", COOKIE_FILE),
+        index_file=settings.get("index_file", INDEX_FILE),
+        headless=True,
+        lean=not args.no_lean,
+        search_navigation=settings.get("search_navigation", "direct"),
+        rate_limits=settings.get("rate_limits"),
+        telemetry=args.telemetry or settings.get("telemetry", False),
+        memory_limits=settings.get("memory_limits"),
+        retry=settings.get("retry"),
+        profile=None if args.profile is None else {"window_seconds": args.profile},
+    )
+
+    summary = {"jobs": [], "requested": sum(job["count"] for job in jobs), "sent": 0}
+    started = time.monotonic()
+    exit_code = EXIT_OK
+    try:
+        if not bot.initialize_driver():
+            emit("error", message="Failed to initialize browser")
+            exit_code = EXIT_SETUP_FAILED
+            return exit_code
+        if not bot.start_session(args.email, os.environ.get("LINKEDIN_PASSWORD", "")):
+            emit("error", message="Login failed")
+            exit_code = EXIT_SETUP_FAILED
+            return exit_code
+        emit("session", reused=bot.session_reused, startup_seconds=bot.startup_seconds)
+
+        for index, job in enumerate(jobs):
+            emit("job_started", job=index, search_query=job["search_query"], count=job["count"])
+            job_started = time.monotonic()
+            if args.dry_run:
+                result = run_dry_job(bot, index, job, args)
+                summary["jobs"].append(result)
+                if not result["ok"]:
+                    exit_code = EXIT_JOB_FAILED
+                continue
+            ok = bot.search_and_connect(job["search_query"], job["count"], bool(job["note"]), job["note"],
+                                        resume=args.resume, filters=job["filters"])
+            result = {
+                "job": index,
+                "search_query": job["search_query"],
+                "requested": job["count"],
+                "sent": bot.requests_sent,
+                "restored": bot.requests_restored,
+                "ok": ok,
+                "seconds": round(time.monotonic() - job_started, 2),
+                "metrics_run_id": (bot.last_run_summary or {}).get("run_id"),
+            }
+            summary["jobs"].append(result)
+            # Sends restored from a checkpoint were counted by the run that made them
+            summary["sent"] += bot.requests_sent - bot.requests_restored
+            emit("job_finished", **result)
+            if not ok:
+                exit_code = EXIT_JOB_FAILED
+            if bot.governor.exhausted_reason:
+                emit("budget_exhausted", reason=bot.governor.exhausted_reason, remaining=bot.governor.remaining())
+                break
+    except KeyboardInterrupt:
+        bot.stop()
+        emit("interrupted", message="Stopped by user")
+        exit_code = EXIT_JOB_FAILED
+    finally:
+        bot.close()
+        summary["seconds"] = round(time.monotonic() - started, 2)
+        summary["exit_code"] = exit_code
+        summary["budget_remaining"] = bot.governor.remaining()
+        emit("summary", **summary)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
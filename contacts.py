@@ -0,0 +1,80 @@
+import os
+import time
+
+INDEX_FILE = "contacted_profiles.tsv"
+
+SENT = "sent"
+SKIPPED = "skipped"
+FAILED = "failed"
+PENDING = "pending"
+OUTCOMES = (SENT, SKIPPED, FAILED, PENDING)
+
+
+class ContactIndex:
+    def __init__(self, path=INDEX_FILE):
+        """On-disk index of profiles already handled, one tab-separated line per outcome"""
+        self.path = path
+        self.outcomes = {}
+        self.times = {}
+        self._file = None
+        self._lines = 0
+        self.load()
+
+    def load(self):
+        """Read the index into memory; later lines override earlier ones"""
+        self.outcomes = {}
+        self.times = {}
+        self._lines = 0
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 3 and parts[1] in OUTCOMES:
+                    self.outcomes[parts[0]] = parts[1]
+                    self.times[parts[0]] = parts[2]
+                    self._lines += 1
+        # Repeated outcomes for the same profile only grow the file
+        if self._lines > 2 * len(self.outcomes) + 1000:
+            self.compact()
+
+    def __contains__(self, profile_id):
+        return profile_id in self.outcomes
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def should_skip(self, profile_id):
+        """True if the profile was already handled; failed attempts may be retried"""
+        outcome = self.outcomes.get(profile_id)
+        return outcome is not None and outcome != FAILED
+
+    def record(self, profile_id, outcome):
+        """Append an outcome for a profile"""
+        if not profile_id or outcome not in OUTCOMES:
+            return
+        now = str(int(time.time()))
+        self.outcomes[profile_id] = outcome
+        self.times[profile_id] = now
+        if not self.path:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(f"{profile_id}\t{outcome}\t{now}\n")
+        self._file.flush()
+        self._lines += 1
+
+    def compact(self):
+        """Rewrite the file with only the latest outcome per profile"""
+        self.close()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for profile_id, outcome in self.outcomes.items():
+                f.write(f"{profile_id}\t{outcome}\t{self.times[profile_id]}\n")
+        os.replace(tmp_path, self.path)
+        self._lines = len(self.outcomes)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,105 @@
+import locators
+
+# Snapshot every result card not seen before in one round trip. Each card
+# is stamped with a data-bot-handle attribute so it can be found again
+# later without holding on to WebElement references that go stale.
+DISCOVER_JS = """
+var cards = Array.prototype.slice.call(document.querySelectorAll(arguments[0]));
+if (!cards.length) {
+    document.querySelectorAll('button').forEach(function (b) {
+        if (b.innerText.trim() === 'Connect') {
+            var card = b.closest('li') || b.parentElement;
+            if (cards.indexOf(card) === -1) { cards.push(card); }
+        }
+    });
+}
+function text(card, selector) {
+    var el = card.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+}
+var out = [];
+cards.forEach(function (card) {
+    if (card.hasAttribute('data-bot-handle')) { return; }
+    window.__botHandleSeq = (window.__botHandleSeq || 0) + 1;
+    var handle = String(window.__botHandleSeq);
+    card.setAttribute('data-bot-handle', handle);
+
+    var link = card.querySelector('a[href*="/in/"]');
+    var match = link ? link.getAttribute('href').match(/\\/in\\/([^\\/?#]+)/) : null;
+    var name = text(card, '.entity-result__title-text a span[aria-hidden=true]') ||
+               (link ? link.innerText.trim().split('\\n')[0] : '');
+
+    var state = 'none';
+    card.querySelectorAll('button').forEach(function (b) {
+        var label = b.innerText.trim();
+        if (state !== 'none') { return; }
+        if (label === 'Connect') { state = 'connect'; }
+        else if (label === 'Pending') { state = 'pending'; }
+        else if (label === 'Follow') { state = 'follow'; }
+        else if (label === 'Message') { state = 'message'; }
+    });
+
+    out.push({
+        handle: handle,
+        profile_id: match ? decodeURIComponent(match[1]) : null,
+        name: name,
+        headline: text(card, '.entity-result__primary-subtitle'),
+        location: text(card, '.entity-result__secondary-subtitle'),
+        button_state: state
+    });
+});
+return out;
+"""
+
+# Scroll the card's Connect button into view and click it in one call.
+CLICK_JS = """
+var card = document.querySelector('[data-bot-handle="' + arguments[0] + '"]');
+if (!card) { return 'missing'; }
+var button = null;
+card.querySelectorAll('button').forEach(function (b) {
+    if (!button && b.innerText.trim() === 'Connect') { button = b; }
+});
+if (!button) { return 'no_button'; }
+button.scrollIntoView({block: 'center'});
+button.click();
+return 'clicked';
+"""
+
+
+# Find a card again by its profile link after the list re-rendered and
+# dropped its handle, and stamp it with the same handle. The id is pulled
+# out of each href exactly as DISCOVER_JS does it and must match in full,
+# so "john-smith" never lands on "john-smith-4a5b6".
+RESTAMP_JS = """
+var links = document.querySelectorAll('a[href*="/in/"]');
+for (var i = 0; i < links.length; i++) {
+    var match = (links[i].getAttribute('href') || '').match(/\\/in\\/([^\\/?#]+)/);
+    if (!match) { continue; }
+    var id;
+    try { id = decodeURIComponent(match[1]); } catch (e) { continue; }
+    if (id !== arguments[0]) { continue; }
+    var card = links[i].closest(arguments[2]) || links[i].closest('li');
+    if (card) { card.setAttribute('data-bot-handle', arguments[1]); return true; }
+}
+return false;
+"""
+
+
+class CardDiscovery:
+    def __init__(self, driver):
+        """Batched, incremental discovery of search result cards"""
+        self.driver = driver
+
+    def discover(self):
+        """Return cards that appeared since the last call, as plain dicts"""
+        return self.driver.execute_script(DISCOVER_JS, locators.RESULT_CARD[1]) or []
+
+    def restamp(self, card):
+        """Re-attach a card's handle after the list re-rendered; False if it is gone"""
+        if not card.get("profile_id"):
+            return False
+        return bool(self.driver.execute_script(RESTAMP_JS, card["profile_id"], card["handle"], locators.RESULT_CARD[1]))
+
+    def click(self, card):
+        """Scroll to and click a card's Connect button; returns the outcome string"""
+        return self.driver.execute_script(CLICK_JS, card["handle"])
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+try:
+    from importlib.metadata import version as _dist_version, PackageNotFoundError
+except ImportError:  # Python < 3.8
+    _dist_version = None
+    PackageNotFoundError = Exception
+
+DRIVER_CACHE_FILE = "driver_cache.json"
+
+# Distributions whose versions decide whether a cached result is still valid
+CACHED_PACKAGES = ("selenium", "webdriver-manager")
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+MAC_CHROME_PLIST = "/Applications/Google Chrome.app/Contents/Info.plist"
+
+
+def package_version(name):
+    """Installed version of a distribution without importing it, or None"""
+    if _dist_version is None:
+        return None
+    try:
+        return _dist_version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def _chrome_binary():
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return os.path.realpath(path)
+    return None
+
+
+class DriverCache:
+    def __init__(self, path=DRIVER_CACHE_FILE):
+        """Remember the chromedriver path and dependency check between launches.
+
+        Entries are keyed on the interpreter, the installed package versions
+        and the local Chrome version, so upgrading any of them invalidates
+        the cache and the next launch resolves everything again.
+        """
+        self.path = path
+        self.entries = {}
+        self.chrome = {}
+        self._key = None
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.entries = state.get("entries", {})
+        self.chrome = state.get("chrome", {})
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self.entries, "chrome": self.chrome}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def chrome_version(self):
+        """Local Chrome version, read without touching the network"""
+        system = platform.system()
+        if system == "Windows":
+            try:
+                import winreg
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                return None
+        if system == "Darwin":
+            try:
+                import plistlib
+                with open(MAC_CHROME_PLIST, "rb") as f:
+                    return plistlib.load(f).get("CFBundleShortVersionString")
+            except (OSError, ValueError):
+                return None
+
+        # Linux: asking the binary costs a process launch, so remember the
+        # answer until the binary on disk changes
+        binary = _chrome_binary()
+        if not binary:
+            return None
+        mtime = os.path.getmtime(binary)
+        if self.chrome.get("path") == binary and self.chrome.get("mtime") == mtime:
+            return self.chrome.get("version")
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        version = output.strip().split()[-1] if output.strip() else None
+        self.chrome = {"path": binary, "mtime": mtime, "version": version}
+        self.save()
+        return version
+
+    def key(self):
+        """Hash of everything a cached entry depends on"""
+        if self._key is None:
+            parts = {
+                "python": sys.executable,
+                "python_version": platform.python_version(),
+                "packages": {name: package_version(name) for name in CACHED_PACKAGES},
+                "chrome": self.chrome_version(),
+            }
+            self._key = hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+        return self._key
+
+    def refresh(self):
+        """Recompute the key on next use, e.g. after packages were installed"""
+        self._key = None
+
+    def get(self, name):
+        """Cached value for name, or None if missing or stale"""
+        entry = self.entries.get(name)
+        if entry and entry.get("key") == self.key():
+            return entry.get("value")
+        return None
+
+    def put(self, name, value):
+        self.entries[name] = {"key": self.key(), "value": value, "updated": time.time()}
+        self.save()
+
+
+def resolve_driver_path(cache):
+    """Return (chromedriver path, cache hit). Only a cache miss may hit the network."""
+    path = cache.get("chromedriver")
+    if path and os.access(path, os.X_OK):
+        return path, True
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception:
+        # Offline: fall back to a chromedriver already on PATH
+        path = shutil.which("chromedriver")
+        if not path:
+            raise
+    cache.put("chromedriver", path)
+    return path, False
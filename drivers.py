@@ -0,0 +1,69 @@
+import abc
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class Driver(abc.ABC):
+    """The part of Selenium's WebDriver API that LinkedInBot, WaitEngine,
+    CardDiscovery and ResultIterator use.
+
+    Selenium's drivers are registered as implementations, and
+    fake_driver.FakeDriver implements it in memory. Anything the bot needs
+    from the browser must go through these methods (plus the WebElement
+    methods click, send_keys, clear, is_displayed, is_enabled and text), so
+    the fake stays a faithful stand-in.
+    """
+
+    @property
+    @abc.abstractmethod
+    def current_url(self):
+        """URL of the page in the current window"""
+
+    @property
+    @abc.abstractmethod
+    def current_window_handle(self):
+        """Handle of the current window or tab"""
+
+    @property
+    @abc.abstractmethod
+    def switch_to(self):
+        """Object with new_window(type_hint) and window(handle)"""
+
+    @abc.abstractmethod
+    def get(self, url):
+        """Load url in the current window"""
+
+    @abc.abstractmethod
+    def find_element(self, by, value):
+        """Return the first matching element or raise NoSuchElementException"""
+
+    @abc.abstractmethod
+    def find_elements(self, by, value):
+        """Return all matching elements, possibly none"""
+
+    @abc.abstractmethod
+    def execute_script(self, script, *args):
+        """Run one of the bot's scripts in the page and return its result"""
+
+    @abc.abstractmethod
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Send a Chrome DevTools Protocol command"""
+
+    @abc.abstractmethod
+    def get_cookies(self):
+        """Cookies visible to the current page, as dicts"""
+
+    @abc.abstractmethod
+    def add_cookie(self, cookie_dict):
+        """Set a cookie for the domain currently loaded"""
+
+    @abc.abstractmethod
+    def close(self):
+        """Close the current window"""
+
+    @abc.abstractmethod
+    def quit(self):
+        """End the session and shut the browser down"""
+
+
+Driver.register(WebDriver)
@@ -0,0 +1,513 @@
+"""
+In-memory stand-in for Chrome, for exercising LinkedInBot without a browser.
+
+FakeLinkedIn models the parts of the site the bot touches: the login form,
+the feed and typeahead, lazily loaded people-search results with
+pagination, and the Connect modal with Add a note and Send. FakeDriver
+implements drivers.Driver against it. Every state change is synchronous,
+so with FAST_TIMEOUTS a whole search_and_connect run takes milliseconds.
+
+    site = FakeLinkedIn(total_results=30, modal_failure_rate=0.1)
+    bot = fake_bot(site)
+    bot.initialize_driver()
+    bot.start_session("user@example.com", "secret")
+    bot.search_and_connect("data engineer", 10)
+    assert len(site.invites) == bot.requests_sent
+
+Failures are scriptable, either by rate (seeded, so reproducible) or for
+specific profile ids, and elements go stale the way Selenium's do when
+the page under them changes.
+"""
+
+from selenium.common.exceptions import (
+    InvalidCookieDomainException, InvalidSessionIdException, NoSuchElementException, NoSuchWindowException,
+    StaleElementReferenceException, WebDriverException,
+)
+from selenium.webdriver.common.keys import Keys
+from urllib.parse import parse_qs, urlencode, urlparse
+import itertools
+import random
+
+import locators
+from discovery import CLICK_JS, DISCOVER_JS, RESTAMP_JS
+from drivers import Driver
+from memory_watchdog import JS_HEAP_JS
+from notes import FILL_NOTE_JS
+from results import SCROLL_JS
+from telemetry import LONG_TASK_OBSERVER_JS, PAGE_SAMPLE_JS
+from waits import RESULTS_SIGNATURE_JS
+
+FAKE_BASE_URL = "https://fake.linkedin.test"
+SESSION_COOKIE = "li_at"
+
+# Timeouts for a bot driven by FakeDriver. Nothing in the fake is
+# asynchronous, so a condition that is not met on the first poll never will be.
+FAST_TIMEOUTS = {
+    "login_form": 0.01,
+    "nav_rendered": 0.01,
+    "session_check": 0.01,
+    "search_box": 0.01,
+    "people_tab": 0.01,
+    "results_loaded": 0.01,
+    "results_changed": 0.0,
+    "modal_open": 0.01,
+    "add_note": 0.01,
+    "note_field": 0.01,
+    "send_enabled": 0.01,
+    "modal_closed": 0.01,
+}
+FAST_POLL = 0.001
+
+
+class FakeLinkedIn:
+    def __init__(self, total_results=100, page_size=10, batch_size=5, email=None, password=None,
+                 pending_rate=0.0, modal_failure_rate=0.0, send_failure_rate=0.0, stale_rate=0.0,
+                 rerender_rate=0.0, reject_js_note=False, heap_growth_mb=0.0, seed=0):
+        """Site state shared by every FakeDriver opened against it.
+
+        email/password of None accept any non-empty credentials. The *_rate
+        knobs fail that fraction of attempts at random; fail_modal_for and
+        fail_send_for fail specific profile ids every time. rerender_rate
+        drops a card's handle on click, as a list re-render does. reject_js_note
+        makes the page ignore script-set note values, forcing send_keys.
+        heap_growth_mb grows the tab's JS heap per Connect click.
+        """
+        self.total_results = total_results
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.email = email
+        self.password = password
+        self.modal_failure_rate = modal_failure_rate
+        self.send_failure_rate = send_failure_rate
+        self.stale_rate = stale_rate
+        self.rerender_rate = rerender_rate
+        self.reject_js_note = reject_js_note
+        self.heap_growth_mb = heap_growth_mb
+        self.fail_modal_for = set()
+        self.fail_send_for = set()
+        self.random = random.Random(seed)
+
+        rng = random.Random(seed)
+        self.profiles = [
+            {
+                "id": f"fake-member-{i}",
+                "name": f"Member{i} Surname{i}",
+                "headline": f"Engineer at Company {i % 7}",
+                "location": "Berlin",
+                "pending": rng.random() < pending_rate,
+            }
+            for i in range(1, total_results + 1)
+        ]
+        self.invites = {}
+        self.sessions = set()
+        self.drivers_opened = 0
+
+    @property
+    def num_pages(self):
+        return max(1, -(-self.total_results // self.page_size))
+
+    def page_profiles(self, page):
+        start = (page - 1) * self.page_size
+        return self.profiles[start:start + self.page_size]
+
+    def accepts(self, email, password):
+        if self.email is None and self.password is None:
+            return bool(email and password)
+        return email == self.email and password == self.password
+
+    def chance(self, rate):
+        return rate > 0 and self.random.random() < rate
+
+    def driver_factory(self):
+        """Pass as LinkedInBot(driver_factory=...); each call opens a new browser"""
+        self.drivers_opened += 1
+        return FakeDriver(self)
+
+
+class FakeElement:
+    def __init__(self, tab, kind, card=None):
+        """A handle on part of the page; stale once the page under it changes"""
+        self.tab = tab
+        self.kind = kind
+        self.card = card
+        self.generation = tab.generation
+        self.value = ""
+
+    def _check(self):
+        if self.tab.closed or self.generation != self.tab.generation:
+            raise StaleElementReferenceException(f"stale element reference: {self.kind}")
+
+    @property
+    def text(self):
+        self._check()
+        return {"add_note": "Add a note", "send": "Send", "people_tab": "People"}.get(self.kind, "")
+
+    @property
+    def tag_name(self):
+        return {"note": "textarea", "username": "input", "password": "input", "search": "input"}.get(self.kind, "button")
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    def is_enabled(self):
+        self._check()
+        return True
+
+    def get_attribute(self, name):
+        self._check()
+        return self.value if name == "value" else None
+
+    def clear(self):
+        self._check()
+        self.value = ""
+        if self.kind == "note":
+            self.tab.modal["note"] = ""
+
+    def send_keys(self, *values):
+        self._check()
+        text = "".join(values)
+        if self.kind == "search" and Keys.RETURN in text:
+            self.value += text.replace(Keys.RETURN, "")
+            self.tab.navigate(f"/search/results/all/?{urlencode({'keywords': self.value})}")
+            return
+        self.value += text
+        if self.kind == "note":
+            self.tab.modal["note"] = self.value
+        elif self.kind in ("username", "password"):
+            self.tab.form[self.kind] = self.value
+
+    def click(self):
+        self._check()
+        if self.tab.site.chance(self.tab.site.stale_rate):
+            self.tab.generation += 1
+            raise StaleElementReferenceException(f"stale element reference: {self.kind}")
+        self.tab.click(self)
+
+
+class FakeTab:
+    def __init__(self, driver, handle):
+        """One browser tab: the loaded page, its rendered results and any open modal"""
+        self.driver = driver
+        self.site = driver.site
+        self.handle = handle
+        self.url = "about:blank"
+        self.path = ""
+        self.query = {}
+        self.generation = 0
+        self.closed = False
+        self.form = {}
+        self.rendered = []
+        self.handles = {}
+        # Never reuses a handle, like window.__botHandleSeq in DISCOVER_JS
+        self.handle_seq = itertools.count(1)
+        self.modal = None
+        self.clicks = 0
+
+    @property
+    def logged_in(self):
+        token = self.driver.cookies.get(SESSION_COOKIE, {}).get("value")
+        return token in self.site.sessions
+
+    @property
+    def page(self):
+        try:
+            return int(self.query.get("page", ["1"])[0])
+        except ValueError:
+            return 1
+
+    def navigate(self, target):
+        """Load target (a URL or path), applying the site's login redirects"""
+        parts = urlparse(target)
+        path = parts.path or "/"
+        if path not in ("/", "/login") and not self.logged_in:
+            path, parts = "/login", urlparse("/login")
+        self.path = path
+        self.query = parse_qs(parts.query)
+        self.url = self.driver.base_url + path + (f"?{parts.query}" if parts.query else "")
+        self.generation += 1
+        self.form = {}
+        self.modal = None
+        self.handles = {}
+        self.rendered = []
+        if self.path.startswith("/search/results/people"):
+            self.render_batch()
+
+    def render_batch(self):
+        """Render the next lazy batch of cards; False when the page is complete"""
+        profiles = self.site.page_profiles(self.page)
+        if len(self.rendered) >= len(profiles):
+            return False
+        self.rendered.extend(profiles[len(self.rendered):len(self.rendered) + self.site.batch_size])
+        return True
+
+    def button_state(self, profile):
+        if profile["pending"] or profile["id"] in self.site.invites:
+            return "pending"
+        return "connect"
+
+    def find(self, locator):
+        """Elements matching one of the bot's locators"""
+        on_login = self.path == "/login"
+        on_people = self.path.startswith("/search/results/people")
+        if locator == locators.USERNAME_FIELD and on_login:
+            return [FakeElement(self, "username")]
+        if locator == locators.PASSWORD_FIELD and on_login:
+            return [FakeElement(self, "password")]
+        if locator == locators.LOGIN_BUTTON and on_login:
+            return [FakeElement(self, "login")]
+        if locator == locators.GLOBAL_NAV and self.logged_in and not on_login and self.path != "/":
+            return [FakeElement(self, "nav")]
+        if locator == locators.SEARCH_BOX and self.logged_in and not on_login:
+            return [FakeElement(self, "search")]
+        if locator == locators.PEOPLE_TAB and self.path.startswith("/search/results/all"):
+            return [FakeElement(self, "people_tab")]
+        if locator == locators.RESULT_CARD and on_people:
+            return [FakeElement(self, "card", card) for card in self.rendered]
+        if locator == locators.CONNECT_BUTTON and on_people:
+            return [FakeElement(self, "connect", card) for card in self.rendered
+                    if self.button_state(card) == "connect"]
+        if self.modal is not None:
+            if locator == locators.MODAL:
+                return [FakeElement(self, "modal")]
+            if locator == locators.ADD_NOTE_BUTTON and self.modal["note"] is None:
+                return [FakeElement(self, "add_note")]
+            if locator == locators.NOTE_FIELD and self.modal["note"] is not None:
+                return [FakeElement(self, "note")]
+            if locator == locators.SEND_BUTTON:
+                return [FakeElement(self, "send")]
+            if locator == locators.DISMISS_BUTTON:
+                return [FakeElement(self, "dismiss")]
+        return []
+
+    def click(self, element):
+        if element.kind == "login":
+            email, password = self.form.get("username", ""), self.form.get("password", "")
+            if self.site.accepts(email, password):
+                token = f"session-{len(self.site.sessions) + 1}"
+                self.site.sessions.add(token)
+                self.driver.cookies[SESSION_COOKIE] = {"name": SESSION_COOKIE, "value": token,
+                                                       "domain": urlparse(self.driver.base_url).hostname}
+                self.navigate("/feed/")
+        elif element.kind == "people_tab":
+            keywords = self.query.get("keywords", [""])[0]
+            self.navigate(f"/search/results/people/?{urlencode({'keywords': keywords})}")
+        elif element.kind == "connect":
+            self.open_modal(element.card)
+        elif element.kind == "add_note":
+            self.modal["note"] = ""
+            self.generation += 1
+        elif element.kind == "send":
+            self.send()
+        elif element.kind == "dismiss":
+            self.modal = None
+            self.generation += 1
+
+    def open_modal(self, card):
+        self.clicks += 1
+        if card["id"] in self.site.fail_modal_for or self.site.chance(self.site.modal_failure_rate):
+            return
+        self.modal = {"card": card, "note": None}
+        self.generation += 1
+
+    def send(self):
+        card = self.modal["card"]
+        if card["id"] in self.site.fail_send_for or self.site.chance(self.site.send_failure_rate):
+            # The request hangs: the modal never closes and nothing is recorded
+            return
+        self.site.invites[card["id"]] = self.modal["note"] or ""
+        self.modal = None
+        self.generation += 1
+
+    # Scripts the bot runs through execute_script
+
+    def discover(self, selector):
+        out = []
+        for card in self.rendered:
+            if card["id"] in self.handles.values():
+                continue
+            handle = str(next(self.handle_seq))
+            self.handles[handle] = card["id"]
+            out.append({
+                "handle": handle,
+                "profile_id": card["id"],
+                "name": card["name"],
+                "headline": card["headline"],
+                "location": card["location"],
+                "button_state": self.button_state(card),
+            })
+        return out
+
+    def click_card(self, handle):
+        profile_id = self.handles.get(handle)
+        card = next((c for c in self.rendered if c["id"] == profile_id), None)
+        if card is None:
+            return "missing"
+        if self.site.chance(self.site.rerender_rate):
+            del self.handles[handle]
+            return "missing"
+        if self.button_state(card) != "connect":
+            return "no_button"
+        self.open_modal(card)
+        return "clicked"
+
+    def restamp(self, profile_id, handle, selector):
+        if not any(card["id"] == profile_id for card in self.rendered):
+            return False
+        self.handles[handle] = profile_id
+        return True
+
+    def scroll(self, step):
+        rendered = self.render_batch()
+        return {
+            "at_bottom": not rendered,
+            "next": "enabled" if self.page < self.site.num_pages else "disabled",
+        }
+
+    def signature(self, selector):
+        connect = sum(1 for card in self.rendered if self.button_state(card) == "connect")
+        return f"{len(self.rendered)}:{connect}:{len(self.rendered) * 120}"
+
+    def fill_note(self, element, text):
+        element._check()
+        if self.site.reject_js_note:
+            return ""
+        element.value = text
+        self.modal["note"] = text
+        return text
+
+    def heap_bytes(self):
+        return int((20 + self.clicks * self.site.heap_growth_mb) * 1024 * 1024)
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, type_hint=None):
+        self.driver._open_tab()
+
+    def window(self, handle):
+        if handle not in self.driver.tabs:
+            raise NoSuchWindowException(f"no such window: {handle}")
+        self.driver.current = handle
+
+
+class FakeDriver(Driver):
+    def __init__(self, site, base_url=FAKE_BASE_URL):
+        """A browser session against a FakeLinkedIn site"""
+        self.site = site
+        self.base_url = base_url
+        self.cookies = {}
+        self.tabs = {}
+        self.current = None
+        self.quit_called = False
+        self._switch_to = FakeSwitchTo(self)
+        self._open_tab()
+        self.scripts = {
+            DISCOVER_JS: lambda tab, args: tab.discover(*args),
+            CLICK_JS: lambda tab, args: tab.click_card(*args),
+            RESTAMP_JS: lambda tab, args: tab.restamp(*args),
+            SCROLL_JS: lambda tab, args: tab.scroll(*args),
+            RESULTS_SIGNATURE_JS: lambda tab, args: tab.signature(*args),
+            FILL_NOTE_JS: lambda tab, args: tab.fill_note(*args),
+            JS_HEAP_JS: lambda tab, args: tab.heap_bytes(),
+            PAGE_SAMPLE_JS: lambda tab, args: {"long_tasks": 0, "long_task_ms": 0, "long_task_max_ms": 0},
+            LONG_TASK_OBSERVER_JS: lambda tab, args: None,
+        }
+
+    def _open_tab(self):
+        handle = f"tab-{len(self.tabs) + 1}"
+        while handle in self.tabs:
+            handle += "x"
+        self.tabs[handle] = FakeTab(self, handle)
+        self.current = handle
+
+    @property
+    def tab(self):
+        if self.quit_called:
+            raise InvalidSessionIdException("invalid session id")
+        if self.current not in self.tabs:
+            raise NoSuchWindowException("no such window: target window already closed")
+        return self.tabs[self.current]
+
+    @property
+    def current_url(self):
+        return self.tab.url
+
+    @property
+    def current_window_handle(self):
+        return self.tab.handle
+
+    @property
+    def switch_to(self):
+        return self._switch_to
+
+    def get(self, url):
+        self.tab.navigate(url)
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"no such element: {value}")
+        return found[0]
+
+    def find_elements(self, by, value):
+        return self.tab.find((by, value))
+
+    def execute_script(self, script, *args):
+        handler = self.scripts.get(script)
+        if handler is None:
+            raise WebDriverException("FakeDriver does not model this script")
+        return handler(self.tab, args)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        tab = self.tab
+        if cmd == "Performance.getMetrics":
+            return {"metrics": [
+                {"name": "JSHeapUsedSize", "value": tab.heap_bytes()},
+                {"name": "JSHeapTotalSize", "value": tab.heap_bytes() * 2},
+                {"name": "Nodes", "value": 500 + 40 * len(tab.rendered)},
+            ]}
+        return {}
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies.values()]
+
+    def add_cookie(self, cookie_dict):
+        if not self.tab.url.startswith(self.base_url):
+            raise InvalidCookieDomainException("invalid cookie domain")
+        self.cookies[cookie_dict["name"]] = dict(cookie_dict)
+
+    def close(self):
+        tab = self.tab
+        tab.closed = True
+        del self.tabs[tab.handle]
+
+    def quit(self):
+        for tab in self.tabs.values():
+            tab.closed = True
+        self.quit_called = True
+
+
+def fake_bot(site, **overrides):
+    """A LinkedInBot wired to site, with nothing written to disk and no rate limits"""
+    from linkedin_bot import LinkedInBot
+    from rate_governor import UNLIMITED
+
+    options = {
+        "update_status_callback": lambda message: None,
+        "driver_factory": site.driver_factory,
+        "base_url": FAKE_BASE_URL,
+        "timeouts": FAST_TIMEOUTS,
+        "poll_frequency": FAST_POLL,
+        "metrics_dir": None,
+        "index_file": None,
+        "checkpoint_file": None,
+        "budget_file": None,
+        "rate_limits": UNLIMITED,
+        "driver_cache_file": None,
+        "retry": {"base_delay": 0, "breaker_cooldown": 0},
+    }
+    options.update(overrides)
+    return LinkedInBot(**options)
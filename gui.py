@@ -4,14 +4,37 @@ import threading
 import time
 import json
 import os
+import queue
+import shutil
 import sys
 
-# Import the bot at module level to avoid circular imports
-try:
-    from linkedin_bot import LinkedInBot
-except ImportError:
-    # Will be handled when login is attempted
-    pass
+# linkedin_bot pulls in selenium and webdriver_manager, so it is imported in
+# the background after the window paints rather than at module level
+from contacts import INDEX_FILE
+from ui_lag import EventLoopMonitor
+
+# Default locations for the persistent browser session
+PROFILE_DIR = "chrome_profile"
+COOKIE_FILE = "linkedin_cookies.json"
+
+# Log pipeline: messages are queued by any thread and drained on a fixed tick
+LOG_TICK_MS = 100
+LOG_BATCH_LIMIT = 500
+MAX_LOG_LINES = 2000
+LOG_OVERFLOW_FILE = "linkedin_activity.log"
+
+# Give Tk time to paint the window before the background import starts
+BOT_PRELOAD_DELAY_MS = 50
+
+# How often the budget / ETA label is refreshed
+BUDGET_REFRESH_MS = 1000
+
+# How often the event-loop lag readout in the Logs tab is refreshed
+LAG_REFRESH_MS = 1000
+
+# How long to wait for the browser to quit before killing it on exit
+CLOSE_TIMEOUT_S = 5
+CLOSE_POLL_MS = 100
 
 class LinkedInAutomationGUI:
     def __init__(self, root):
@@ -28,15 +51,41 @@ class LinkedInAutomationGUI:
         self.include_note_var = tk.BooleanVar(value=False)
         self.custom_note_var = tk.StringVar(value="Hi, I'd like to connect with you!")
         self.save_creds_var = tk.BooleanVar(value=False)
+        self.lean_mode_var = tk.BooleanVar(value=False)
+        self.telemetry_var = tk.BooleanVar(value=False)
+        self.profile_var = tk.BooleanVar(value=False)
+        self.profile_window_var = tk.StringVar(value="0")
+        self.resume_var = tk.BooleanVar(value=False)
+        
+        # Full contents of the settings file, including keys without a widget
+        self.settings = {}
         
         # Status message and automation instance
         self.status_message = ""
+        self.log_queue = queue.Queue()
         self.bot = None
         self.automation_running = False
+        self.current_target = 0
+        self.automation_started = None
         
         # Create tabbed interface
         self.create_notebook()
         
+        # Start draining queued log messages
+        self.root.after(LOG_TICK_MS, self.drain_log_queue)
+        
+        # Keep the remaining budget and projected finish time current
+        self.root.after(BUDGET_REFRESH_MS, self.refresh_budget)
+        
+        # Watch for main-thread stalls; blocks are reported in the log
+        self.lag_monitor = EventLoopMonitor(self.root, on_block=self.report_ui_block)
+        self.lag_monitor.start()
+        self.root.after(LAG_REFRESH_MS, self.refresh_lag)
+        
+        # Load the Selenium stack while the user types credentials
+        self.bot_module_ready = threading.Event()
+        self.root.after(BOT_PRELOAD_DELAY_MS, self.preload_bot_module)
+        
         # Try to load saved settings
         self.load_settings()
     
@@ -111,13 +160,21 @@ class LinkedInAutomationGUI:
         self.note_entry = ttk.Entry(frame, textvariable=self.custom_note_var, width=40, state="disabled")
         self.note_entry.grid(row=3, column=1, padx=10, pady=10)
         
+        # Resume option
+        ttk.Checkbutton(frame, text="Resume interrupted run for this search", variable=self.resume_var).grid(
+            row=5, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+        
         # Status label
         self.connect_status_label = ttk.Label(frame, text="")
-        self.connect_status_label.grid(row=4, column=0, columnspan=2, padx=10, pady=10)
+        self.connect_status_label.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
+        
+        # Rate budget and projected finish time
+        self.budget_label = ttk.Label(frame, text="Budget: log in to see remaining invitations")
+        self.budget_label.grid(row=8, column=0, columnspan=2, padx=10, pady=5)
         
         # Control buttons frame
         button_frame = ttk.Frame(frame)
-        button_frame.grid(row=5, column=0, columnspan=2, padx=10, pady=10)
+        button_frame.grid(row=7, column=0, columnspan=2, padx=10, pady=10)
         
         # Start button
         self.start_button = ttk.Button(button_frame, text="Start Automation", command=self.start_automation)
@@ -136,6 +193,21 @@ class LinkedInAutomationGUI:
         clear_button = ttk.Button(frame, text="Clear Saved Credentials", command=self.clear_saved_credentials)
         clear_button.pack(pady=20)
         
+        # Browser mode
+        ttk.Checkbutton(frame, text="Lean browser mode (headless, no images/media/fonts)",
+                        variable=self.lean_mode_var, command=self.save_settings).pack(padx=10, pady=5, anchor="w")
+        ttk.Checkbutton(frame, text="Collect page performance telemetry (JS heap, DOM nodes, long tasks)",
+                        variable=self.telemetry_var, command=self.save_settings).pack(padx=10, pady=5, anchor="w")
+        
+        # Profiling
+        profile_frame = ttk.Frame(frame)
+        profile_frame.pack(padx=10, pady=5, anchor="w")
+        ttk.Checkbutton(profile_frame, text="Profile runs (stack samples + cProfile, saved with run metrics)",
+                        variable=self.profile_var, command=self.save_settings).pack(side="left")
+        ttk.Label(profile_frame, text="  first").pack(side="left")
+        ttk.Entry(profile_frame, textvariable=self.profile_window_var, width=5).pack(side="left")
+        ttk.Label(profile_frame, text="s (0 = whole run)").pack(side="left")
+        
         # About section
         about_frame = ttk.LabelFrame(frame, text="About")
         about_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -160,27 +232,80 @@ class LinkedInAutomationGUI:
         # Clear logs button
         clear_logs_button = ttk.Button(frame, text="Clear Logs", command=self.clear_logs)
         clear_logs_button.pack(pady=10)
+        
+        # Per-phase timing summary of the last run
+        summary_frame = ttk.LabelFrame(self.logs_frame, text="Last Run Summary")
+        summary_frame.pack(fill="both", padx=20, pady=(0, 20))
+        
+        columns = ("count", "total", "p50", "p95", "max")
+        self.summary_table = ttk.Treeview(summary_frame, columns=columns, height=6)
+        self.summary_table.heading("#0", text="Phase")
+        self.summary_table.column("#0", width=140)
+        for column in columns:
+            self.summary_table.heading(column, text=column.capitalize() if column == "count" else f"{column} (s)")
+            self.summary_table.column(column, width=70, anchor="e")
+        self.summary_table.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        # Tk event-loop responsiveness since startup
+        self.lag_label = ttk.Label(summary_frame, text="UI lag: measuring...")
+        self.lag_label.pack(anchor="w", padx=5, pady=(0, 5))
+    
+    def preload_bot_module(self):
+        """Import linkedin_bot on a worker thread so Login does not wait for it"""
+        def preload():
+            try:
+                import linkedin_bot  # noqa: F401
+                from log_setup import configure_logging
+                configure_logging(self.settings.get("logging"))
+            except ImportError as e:
+                self.update_status(f"⚠️ Could not load automation module: {e}")
+            finally:
+                self.bot_module_ready.set()
+        
+        threading.Thread(target=preload, daemon=True).start()
     
     def handle_login(self):
         """Handle the login process"""
-        if not self.email_var.get() or not self.password_var.get():
+        reuse_session = self.settings.get("reuse_session", True)
+        if not reuse_session and (not self.email_var.get() or not self.password_var.get()):
             messagebox.showerror("Error", "Please enter both email and password")
             return
             
         self.update_status("Initializing login process...")
+        self.login_status_label.config(text="Starting browser...")
         
         def login_thread():
             try:
-                # Import here for thread safety
+                # Usually already loaded by preload_bot_module; imports are thread safe
+                if not self.bot_module_ready.is_set():
+                    self.update_status("⏳ Loading automation module...")
+                    self.bot_module_ready.wait()
                 from linkedin_bot import LinkedInBot
+                from log_setup import configure_logging
+                configure_logging(self.settings.get("logging"))
+                
+                self.bot = LinkedInBot(
+                    update_status_callback=self.update_status,
+                    timeouts=self.settings.get("timeouts"),
+                    profile_dir=self.settings.get("profile_dir", PROFILE_DIR) if reuse_session else None,
+                    cookie_file=self.settings.get("cookie_file", COOKIE_FILE) if reuse_session else None,
+                    index_file=self.settings.get("index_file", INDEX_FILE),
+                    lean=self.lean_mode_var.get(),
+                    search_navigation=self.settings.get("search_navigation", "direct"),
+                    rate_limits=self.settings.get("rate_limits"),
+                    telemetry=self.telemetry_var.get(),
+                    memory_limits=self.settings.get("memory_limits"),
+                    retry=self.settings.get("retry"),
+                )
                 
-                self.bot = LinkedInBot(update_status_callback=self.update_status)
+                self.bot.summary_hooks.append(self.lag_monitor.export)
                 
                 if not self.bot.initialize_driver():
                     self.update_status("Failed to initialize browser")
+                    self.root.after(0, lambda: self.login_status_label.config(text="Browser failed to start"))
                     return
                     
-                success = self.bot.login(self.email_var.get(), self.password_var.get())
+                success = self.bot.start_session(self.email_var.get(), self.password_var.get())
                 
                 if success:
                     # Save credentials if requested
@@ -188,7 +313,9 @@ class LinkedInAutomationGUI:
                         self.save_settings()
                     
                     # Update UI
-                    self.root.after(0, lambda: self.login_status_label.config(text="Logged in successfully"))
+                    kind = "reused session" if self.bot.session_reused else "fresh login"
+                    status = f"Logged in ({kind}, startup {self.bot.startup_seconds:.1f}s)"
+                    self.root.after(0, lambda: self.login_status_label.config(text=status))
                     self.root.after(0, lambda: self.notebook.select(1))  # Switch to Connect tab
                 else:
                     self.root.after(0, lambda: self.login_status_label.config(text="Login failed"))
@@ -224,19 +351,34 @@ class LinkedInAutomationGUI:
         self.start_button.config(state="disabled")
         self.stop_button.config(state="normal")
         self.automation_running = True
+        self.current_target = num_requests
+        self.automation_started = time.monotonic()
             
         # Get parameters
         search_query = self.search_query_var.get()
         include_note = self.include_note_var.get()
         custom_note = self.custom_note_var.get() if include_note else ""
+        self.bot.profile = self.profile_settings()
+        self.lag_monitor.begin_window()
+        self.bot.profile_threads = {"tk": threading.main_thread().ident}
+        resume = self.resume_var.get()
             
         def automation_thread():
             try:
                 self.update_status(f"Starting automation for '{search_query}'...")
-                self.bot.search_and_connect(search_query, num_requests, include_note, custom_note)
+                self.bot.search_and_connect(search_query, num_requests, include_note, custom_note, resume=resume)
             except Exception as e:
                 self.update_status(f"Error in automation: {e}")
             finally:
+                if self.bot.last_stop_latency is not None:
+                    self.update_status(f"⏹️ Stopped in {self.bot.last_stop_latency * 1000:.0f} ms")
+                    self.bot.last_stop_latency = None
+                
+                # Show where the run spent its time
+                summary = self.bot.last_run_summary
+                if summary:
+                    self.root.after(0, lambda: self.show_run_summary(summary))
+                
                 # Re-enable UI elements
                 self.root.after(0, lambda: self.start_button.config(state="normal"))
                 self.root.after(0, lambda: self.stop_button.config(state="disabled"))
@@ -245,6 +387,16 @@ class LinkedInAutomationGUI:
         # Run automation in a separate thread
         threading.Thread(target=automation_thread, daemon=True).start()
     
+    def profile_settings(self):
+        """Profiler options for the next run, or None when profiling is off"""
+        if not self.profile_var.get():
+            return None
+        try:
+            window = max(0.0, float(self.profile_window_var.get() or 0))
+        except ValueError:
+            window = 0.0
+        return {"window_seconds": window}
+    
     def stop_automation(self):
         """Stop the automation process"""
         if self.bot and self.automation_running:
@@ -256,6 +408,46 @@ class LinkedInAutomationGUI:
             self.stop_button.config(state="disabled")
             # Don't enable start button until automation is fully stopped
     
+    def refresh_budget(self):
+        """Show the remaining rate budget and, while running, the projected finish time"""
+        if self.bot:
+            governor = self.bot.governor
+            remaining = governor.remaining()
+            parts = []
+            if remaining["daily"] is not None:
+                parts.append(f"{remaining['daily']} left today")
+            if remaining["weekly"] is not None:
+                parts.append(f"{remaining['weekly']} this week")
+            text = "Budget: " + (", ".join(parts) if parts else "unlimited")
+            
+            if self.automation_running:
+                sent = self.bot.requests_sent
+                elapsed = time.monotonic() - self.automation_started
+                per_request = elapsed / sent if sent else 0.0
+                finish, sends, frees_at = governor.projected_finish(max(0, self.current_target - sent), per_request)
+                text += f" | Projected finish: {self.format_clock(finish)}"
+                if frees_at is not None:
+                    text += f" (stops after {sends} more; budget frees at {self.format_clock(frees_at)})"
+            self.budget_label.config(text=text)
+        
+        self.root.after(BUDGET_REFRESH_MS, self.refresh_budget)
+    
+    def format_clock(self, timestamp):
+        fmt = "%H:%M" if timestamp - time.time() < 86400 else "%a %d %b %H:%M"
+        return time.strftime(fmt, time.localtime(timestamp))
+    
+    def refresh_lag(self):
+        """Show event-loop lag percentiles and the number of main-thread blocks"""
+        stats = self.lag_monitor.stats()
+        self.lag_label.config(
+            text=f"UI lag: p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms, "
+                 f"p99 {stats['p99_ms']:.0f} ms, max {stats['max_ms']:.0f} ms | {stats['blocks']} blocks"
+        )
+        self.root.after(LAG_REFRESH_MS, self.refresh_lag)
+    
+    def report_ui_block(self, block):
+        self.update_status(f"🐢 UI blocked for {block['seconds'] * 1000:.0f} ms in {block['where']}")
+    
     def toggle_note_field(self):
         """Enable or disable the note field based on checkbox"""
         if self.include_note_var.get():
@@ -264,25 +456,57 @@ class LinkedInAutomationGUI:
             self.note_entry.config(state="disabled")
     
     def update_status(self, message):
-        """Update status message and log"""
-        self.status_message = message
+        """Queue a status message; safe to call from any thread"""
+        self.log_queue.put((time.strftime("%Y-%m-%d %H:%M:%S"), message))
+    
+    def drain_log_queue(self):
+        """Move queued messages into the log with a single insert per tick"""
+        entries = []
+        try:
+            while len(entries) < LOG_BATCH_LIMIT:
+                entries.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
         
-        # Update connection status label
-        self.root.after(0, lambda: self.connect_status_label.config(text=message))
+        if entries:
+            self.status_message = entries[-1][1]
+            self.connect_status_label.config(text=self.status_message)
+            self.add_log("".join(f"[{timestamp}] {message}\n" for timestamp, message in entries))
         
-        # Add to logs
-        self.root.after(0, self.add_log)
+        self.root.after(LOG_TICK_MS, self.drain_log_queue)
     
-    def add_log(self):
-        """Add message to log"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {self.status_message}\n"
-        
+    def add_log(self, text):
+        """Append text to the log, spilling the oldest lines to disk past MAX_LOG_LINES"""
         self.log_text.config(state="normal")
-        self.log_text.insert(tk.END, log_entry)
+        self.log_text.insert(tk.END, text)
+        
+        line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        overflow = line_count - MAX_LOG_LINES
+        if overflow > 0:
+            cut = f"{overflow + 1}.0"
+            try:
+                with open(LOG_OVERFLOW_FILE, "a", encoding="utf-8") as f:
+                    f.write(self.log_text.get("1.0", cut))
+            except Exception as e:
+                print(f"Error writing log overflow: {e}")
+            self.log_text.delete("1.0", cut)
+        
         self.log_text.see(tk.END)
         self.log_text.config(state="disabled")
     
+    def show_run_summary(self, summary):
+        """Fill the summary table with per-phase timings, slowest first"""
+        self.summary_table.delete(*self.summary_table.get_children())
+        phases = sorted(summary["phases"].items(), key=lambda item: -item[1]["total"])
+        for phase, stats in phases:
+            self.summary_table.insert("", tk.END, text=phase, values=(
+                stats["count"],
+                f"{stats['total']:.2f}",
+                f"{stats['p50']:.2f}",
+                f"{stats['p95']:.2f}",
+                f"{stats['max']:.2f}",
+            ))
+    
     def clear_logs(self):
         """Clear the logs"""
         self.log_text.config(state="normal")
@@ -291,12 +515,17 @@ class LinkedInAutomationGUI:
     
     def save_settings(self):
         """Save settings to file"""
-        settings = {
+        settings = dict(self.settings)
+        settings.update({
             "email": self.email_var.get() if self.save_creds_var.get() else "",
             "search_query": self.search_query_var.get(),
             "include_note": self.include_note_var.get(),
             "custom_note": self.custom_note_var.get(),
-        }
+            "lean_mode": self.lean_mode_var.get(),
+            "telemetry": self.telemetry_var.get(),
+            "profile_runs": self.profile_var.get(),
+            "profile_window": self.profile_window_var.get(),
+        })
         
         try:
             with open("linkedin_settings.json", "w") as f:
@@ -310,6 +539,7 @@ class LinkedInAutomationGUI:
             if os.path.exists("linkedin_settings.json"):
                 with open("linkedin_settings.json", "r") as f:
                     settings = json.load(f)
+                    self.settings = settings
                     
                     if "email" in settings and settings["email"]:
                         self.email_var.set(settings["email"])
@@ -324,6 +554,18 @@ class LinkedInAutomationGUI:
                     
                     if "custom_note" in settings:
                         self.custom_note_var.set(settings["custom_note"])
+                    
+                    if "lean_mode" in settings:
+                        self.lean_mode_var.set(settings["lean_mode"])
+                    
+                    if "telemetry" in settings:
+                        self.telemetry_var.set(settings["telemetry"])
+                    
+                    if "profile_runs" in settings:
+                        self.profile_var.set(settings["profile_runs"])
+                    
+                    if "profile_window" in settings:
+                        self.profile_window_var.set(settings["profile_window"])
         except Exception as e:
             print(f"Error loading settings: {e}")
     
@@ -335,19 +577,44 @@ class LinkedInAutomationGUI:
                     settings = json.load(f)
                 
                 settings["email"] = ""
+                self.settings["email"] = ""
                 
                 with open("linkedin_settings.json", "w") as f:
                     json.dump(settings, f)
-                    
-                messagebox.showinfo("Success", "Saved credentials cleared")
+            
+            # A saved session is as good as a password, so drop it too
+            cookie_file = self.settings.get("cookie_file", COOKIE_FILE)
+            if os.path.exists(cookie_file):
+                os.remove(cookie_file)
+            if not (self.bot and self.bot.driver):
+                shutil.rmtree(self.settings.get("profile_dir", PROFILE_DIR), ignore_errors=True)
+                
+            messagebox.showinfo("Success", "Saved credentials cleared")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to clear credentials: {e}")
     
     def on_closing(self):
-        """Handle application closing"""
-        if self.bot:
-            if self.automation_running:
-                self.bot.stop()
-            self.bot.close()
+        """Handle application closing without blocking the Tk thread on driver.quit()"""
+        self.lag_monitor.stop()
+        if not self.bot:
+            self.root.destroy()
+            return
+        
+        if self.automation_running:
+            self.bot.stop()
+        self.root.withdraw()
+        
+        closer = threading.Thread(target=self.bot.close, daemon=True)
+        closer.start()
+        deadline = time.monotonic() + CLOSE_TIMEOUT_S
+        
+        def wait_for_close():
+            if closer.is_alive() and time.monotonic() < deadline:
+                self.root.after(CLOSE_POLL_MS, wait_for_close)
+                return
+            if closer.is_alive():
+                print("Browser did not quit in time, killing it")
+                self.bot.force_close()
+            self.root.destroy()
         
-        self.root.destroy()
\ No newline at end of file
+        wait_for_close()
\ No newline at end of file
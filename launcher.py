@@ -9,8 +9,15 @@ import subprocess
 import os
 import platform
 
-def check_dependencies():
-    """Check if required packages are installed"""
+from driver_cache import DriverCache
+
+def check_dependencies(cache=None):
+    """Check if required packages are installed, trusting a cached result
+    for the same interpreter, package versions and Chrome version"""
+    if cache is not None and cache.get("dependencies"):
+        print("Dependencies verified (cached)")
+        return True
+    
     try:
         # Check Python version
         python_version = sys.version_info
@@ -41,7 +48,11 @@ def check_dependencies():
         except ImportError:
             print("webdriver-manager not found. Installing...")
             subprocess.check_call([sys.executable, "-m", "pip", "install", "webdriver-manager"])
-            
+        
+        if cache is not None:
+            # Re-key after any install so the next launch skips the check
+            cache.refresh()
+            cache.put("dependencies", True)
         return True
         
     except Exception as e:
@@ -87,7 +98,7 @@ def main():
         input("Press Enter to exit...")
         return
         
-    if check_dependencies():
+    if check_dependencies(DriverCache()):
         print("\nAll dependencies satisfied. Starting application...\n")
         try:
             from main import main as start_app
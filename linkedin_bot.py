@@ -1,192 +1,790 @@
 from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlencode
+import json
 import logging
+import os
+import signal
+import threading
+import time
+
+import contacts
+import locators
+from card_export import CardExporter
+from cancellation import Cancelled, CancellationToken
+from browser import apply_lean_blocking, browser_footprint, build_chrome_options, process_tree
+from checkpoint import Checkpoint, CHECKPOINT_FILE, page_from_url
+from contacts import ContactIndex
+from driver_cache import DriverCache, DRIVER_CACHE_FILE, resolve_driver_path
+from discovery import CardDiscovery
+from log_setup import RunLogger
+from memory_watchdog import MemoryWatchdog, RECYCLE_DRIVER
+from metrics import RunMetrics, METRICS_DIR, format_summary
+from notes import NoteTemplate, DEFAULT_NOTE, fill_note
+from profiler import RunProfiler
+from rate_governor import RateGovernor, BUDGET_FILE
+from results import ResultIterator, DEFAULT_MAX_PAGES
+from retry import (
+    CircuitBreaker, ConnectFailed, RetryEngine, StepTimeout, DEFAULT_RETRY, NOTE_FAILED, STALE,
+)
+from telemetry import PageTelemetry
+from waits import WaitEngine
+
+BASE_URL = "https://www.linkedin.com"
+PEOPLE_SEARCH_PATH = "/search/results/people/"
+
+# How search_and_connect reaches the results: "direct" loads the people
+# search URL, "typeahead" types into the search box and clicks People
+NAVIGATION_DIRECT = "direct"
+NAVIGATION_TYPEAHEAD = "typeahead"
+
+
+def people_search_url(base_url, search_query, filters=None):
+    """Build the people-search results URL for a query and optional filters.
+
+    List values are encoded the way LinkedIn's own filter links are, e.g.
+    {"network": ["F", "S"]} becomes network=["F","S"].
+    """
+    params = {"keywords": search_query, "origin": "GLOBAL_SEARCH_HEADER"}
+    for key, value in (filters or {}).items():
+        if isinstance(value, (list, tuple)):
+            value = json.dumps(list(value), separators=(",", ":"))
+        params[key] = value
+    return base_url + PEOPLE_SEARCH_PATH + "?" + urlencode(params)
 
 class LinkedInBot:
-    def __init__(self, update_status_callback=None):
-        """Initialize the LinkedIn automation bot"""
+    def __init__(self, update_status_callback=None, timeouts=None, profile_dir=None, cookie_file=None,
+                 base_url=BASE_URL, headless=False, metrics_dir=METRICS_DIR, index_file=contacts.INDEX_FILE,
+                 lean=False, checkpoint_file=CHECKPOINT_FILE, search_navigation=NAVIGATION_DIRECT,
+                 budget_file=BUDGET_FILE, rate_limits=None, driver_cache_file=DRIVER_CACHE_FILE,
+                 telemetry=False, memory_limits=None, driver_factory=None, poll_frequency=0.1, profile=None, retry=None):
+        """Initialize the LinkedIn automation bot.
+
+        driver_factory, if given, is called with no arguments to open each
+        browser (see drivers.Driver and fake_driver); by default Chrome is used.
+        profile, e.g. {"window_seconds": 0}, profiles every search_and_connect
+        run; threads in profile_threads ({name: ident}) are sampled too.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.headless = headless
+        self.lean = lean
+        self.search_navigation = search_navigation
+        self.metrics_dir = metrics_dir
+        self.metrics = RunMetrics(metrics_dir)
+        self.last_run_summary = None
+        self.contacts = ContactIndex(index_file)
+        self.checkpoint = Checkpoint(checkpoint_file)
+        self.governor = RateGovernor(budget_file, rate_limits)
+        self.driver_cache = DriverCache(driver_cache_file)
+        self.collect_telemetry = telemetry
+        self.telemetry = None
+        self.watchdog = MemoryWatchdog(memory_limits)
+        self.driver_factory = driver_factory
+        self.profile = profile
+        self.profile_threads = {}
+        self.profiler = None
+        # Callables run with the run's RunMetrics just before it is finished,
+        # so callers (e.g. the GUI) can attach their own measurements
+        self.summary_hooks = []
+        self.retry_settings = dict(DEFAULT_RETRY)
+        self.retry_settings.update(retry or {})
+        self.retry = None
+        self.last_dry_run = None
+        self.poll_frequency = poll_frequency
         self.driver = None
+        self.waits = None
+        self.timeouts = timeouts or {}
+        self.profile_dir = profile_dir
+        self.cookie_file = cookie_file
+        self.session_reused = False
+        self.startup_seconds = None
+        self._startup_began = None
         self.update_status = update_status_callback or (lambda msg: print(msg))
         self.is_running = False
+        self.requests_sent = 0
+        # Sends carried over from a resumed checkpoint; included in requests_sent
+        self.requests_restored = 0
+        self.cancel_token = CancellationToken()
+        self.last_stop_latency = None
+        self._stop_requested_at = None
         
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.logger = logging.getLogger('linkedin_bot')
+        # Handlers are set up once per process by log_setup.configure_logging;
+        # every record carries the id of the run it belongs to
+        self.logger = RunLogger(logging.getLogger('linkedin_bot'), lambda: self.metrics.run_id)
 
     def initialize_driver(self):
         """Set up the Chrome browser driver"""
         try:
             self.update_status("Initializing Chrome driver...")
-            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+            self._startup_began = time.monotonic()
+            if self.driver_factory:
+                with self.metrics.span("driver_init", factory=True):
+                    self.driver = self.driver_factory()
+            else:
+                self.driver = self.create_chrome_driver()
+            if self.lean:
+                apply_lean_blocking(self.driver)
+            if self.collect_telemetry:
+                self.telemetry = PageTelemetry(self.driver)
+                self.telemetry.enable()
+            self.waits = WaitEngine(self.driver, self.timeouts, poll_frequency=self.poll_frequency,
+                                    cancel_token=self.cancel_token)
             return True
         except Exception as e:
             self.update_status(f"Error initializing driver: {e}")
-            self.logger.error(f"Driver initialization error: {e}")
+            self.logger.error("Driver initialization error: %s", e, extra={"phase": "driver_init"})
             return False
 
+    def create_chrome_driver(self):
+        """Start Chrome with the configured profile and mode"""
+        options = build_chrome_options(self.profile_dir, self.headless, self.lean)
+        with self.metrics.span("driver_resolve") as attrs:
+            driver_path, attrs["cached"] = resolve_driver_path(self.driver_cache)
+        with self.metrics.span("driver_init", lean=self.lean):
+            return webdriver.Chrome(service=Service(driver_path), options=options)
+
     def login(self, email, password):
         """Log in to LinkedIn with provided credentials"""
         try:
             self.update_status("Opening LinkedIn login page...")
-            self.driver.get("https://www.linkedin.com/login")
-            time.sleep(2)
+            self.driver.get(self.base_url + "/login")
 
             self.update_status("Entering login credentials...")
-            username_field = self.driver.find_element(By.ID, "username")
-            password_field = self.driver.find_element(By.ID, "password")
+            username_field = self.waits.login_form()
+            password_field = self.driver.find_element(*locators.PASSWORD_FIELD)
 
             username_field.send_keys(email)
             password_field.send_keys(password)
 
-            login_button = self.driver.find_element(By.XPATH, "//button[@type='submit']")
+            login_button = self.driver.find_element(*locators.LOGIN_BUTTON)
             login_button.click()
 
-            # Wait for login to complete
-            time.sleep(3)
-
-            # Check if login was successful
+            # Wait for the navigation bar, which only renders once logged in
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "global-nav"))
-                )
+                self.waits.nav_rendered()
                 self.update_status("✅ Login successful!")
-                self.logger.info("Login successful")
+                self.logger.info("Login successful", extra={"phase": "login"})
                 return True
-            except:
+            except TimeoutException:
                 self.update_status("❌ Login failed. Please check your credentials.")
-                self.logger.error("Login failed")
+                self.logger.error("Login failed", extra={"phase": "login"})
                 return False
 
         except Exception as e:
             self.update_status(f"Error during login: {e}")
-            self.logger.error(f"Login error: {e}")
+            self.logger.error("Login error: %s", e, extra={"phase": "login"})
             return False
 
-    def search_and_connect(self, search_query, num_requests, include_note=False, custom_note=""):
+    def start_session(self, email, password):
+        """Reuse a stored session if it is still valid, otherwise log in"""
+        # Without a browser profile or cookie jar there is no session to check for
+        self.session_reused = False
+        if self.profile_dir or self.cookie_file:
+            with self.metrics.span("session_restore"):
+                self.session_reused = self.restore_session()
+        if self.session_reused:
+            success = True
+        elif not email or not password:
+            self.update_status("❌ No reusable session. Please enter your credentials.")
+            success = False
+        else:
+            with self.metrics.span("login"):
+                success = self.login(email, password)
+            if success:
+                self.save_session()
+
+        if success and self._startup_began is not None:
+            self.startup_seconds = time.monotonic() - self._startup_began
+            kind = "reused session" if self.session_reused else "fresh login"
+            self.logger.info("Startup took %.1fs (%s)", self.startup_seconds, kind, extra={"phase": "startup"})
+        return success
+
+    def restore_session(self):
+        """Return True if the browser profile or cookie jar holds a live session"""
+        try:
+            self.update_status("Checking for a saved session...")
+            self.driver.get(self.base_url + "/feed/")
+            if self.waits.session_state() == "valid":
+                self.update_status("✅ Reusing saved browser session")
+                return True
+
+            if not self.cookie_file or not os.path.exists(self.cookie_file):
+                return False
+
+            with open(self.cookie_file, "r") as f:
+                cookies = json.load(f)
+            if self.apply_cookies(cookies):
+                self.update_status("✅ Restored session from saved cookies")
+                return True
+        except Exception as e:
+            self.logger.warning("Session restore failed: %s", e, extra={"phase": "session_restore"})
+        return False
+
+    def apply_cookies(self, cookies):
+        """Load cookies into the browser; True if they give a live session"""
+        # Cookies can only be set for the domain currently loaded
+        self.driver.get(self.base_url)
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                self.logger.debug("Skipping cookie %s: %s", cookie.get("name"), e)
+        self.driver.get(self.base_url + "/feed/")
+        return self.waits.session_state() == "valid"
+
+    def save_session(self):
+        """Write the current session cookies to the cookie jar"""
+        if not self.cookie_file:
+            return
+        try:
+            # The jar holds auth cookies, so keep it private to the user
+            fd = os.open(self.cookie_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.driver.get_cookies(), f)
+        except Exception as e:
+            self.logger.warning("Could not save session cookies: %s", e)
+
+    def search_and_connect(self, search_query, num_requests, include_note=False, custom_note="", resume=False,
+                           filters=None):
         """Search for profiles and send connection requests"""
         if not self.driver:
             self.update_status("⚠️ Browser not initialized. Please log in first.")
             return False
 
+        # Compile the note template once for the whole run
+        note_template = None
+        if include_note:
+            try:
+                note_template = NoteTemplate(custom_note or DEFAULT_NOTE)
+            except ValueError as e:
+                self.update_status(f"⚠️ {e}")
+                return False
+
+        saved = self.checkpoint.load() if resume else None
+        if saved and saved.get("search_query") != search_query:
+            self.update_status("⚠️ Saved progress is for a different search, starting over")
+            saved = None
+
+        self.requests_sent = 0
+        self.requests_restored = 0
+        self.cancel_token.reset()
+        self._stop_requested_at = None
+        self.is_running = True
+        self.start_profiler()
         try:
-            # Search for the query
-            self.update_status(f"🔎 Searching for '{search_query}'...")
-            search_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//input[contains(@class, 'search-global-typeahead__input')]"))
+            if saved:
+                self.resume_search_results(saved)
+            else:
+                self.open_search_results(search_query, filters)
+            results_url = self.driver.current_url
+            self.sample_telemetry("navigation", page=page_from_url(results_url))
+
+            requests_sent = saved["requests_sent"] if saved else 0
+            self.requests_sent = requests_sent
+            self.requests_restored = requests_sent
+            if requests_sent >= num_requests:
+                self.checkpoint.clear()
+                self.update_status(f"🎉 Already sent {requests_sent} connection requests for this search")
+                self.finish_run()
+                self.is_running = False
+                return True
+            self.checkpoint.save(search_query, num_requests, requests_sent, results_url)
+            discovery = CardDiscovery(self.driver)
+            retry = RetryEngine(self.cancel_token, self.retry_settings["base_delay"], self.retry_settings["max_delay"])
+            self.retry = retry
+            breaker = CircuitBreaker(
+                window=self.retry_settings["breaker_window"],
+                threshold=self.retry_settings["breaker_threshold"],
+                min_attempts=self.retry_settings["breaker_min_attempts"],
+                max_trips=self.retry_settings["breaker_max_trips"],
             )
-            search_box.clear()
-            search_box.send_keys(search_query)
-            search_box.send_keys(Keys.RETURN)
-            time.sleep(3)
+            results = ResultIterator(self.driver, self.waits, discovery, self.metrics)
+            results.on_page_done = lambda stats: self.update_status(
+                f"📄 Page {stats['page']}: {stats['cards']} cards in {stats['seconds']:.1f}s"
+            )
+            results.on_navigate = lambda page: self.sample_telemetry("navigation", page=page)
 
-            # Navigate to the People tab
-            self.update_status("📍 Navigating to People tab...")
-            try:
-                people_tab = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'People')]"))
-                )
-                people_tab.click()
-                time.sleep(3)
-            except Exception as e:
-                self.update_status("⚠️ Could not find People tab, may already be on results")
-                self.logger.warning(f"People tab navigation: {e}")
+            for card in results:
+                profile_id = card["profile_id"]
+                if card["button_state"] == "pending":
+                    if profile_id not in self.contacts:
+                        self.contacts.record(profile_id, contacts.PENDING)
+                    continue
+                if card["button_state"] != "connect":
+                    # Already connected, follow-only or no action offered
+                    if profile_id not in self.contacts:
+                        self.contacts.record(profile_id, contacts.SKIPPED)
+                    continue
+                if self.contacts.should_skip(profile_id):
+                    self.metrics.event("already_contacted", profile_id=profile_id)
+                    continue
 
-            self.is_running = True
-            requests_sent = 0
+                # Hold the send until the rate budget allows it
+                with self.metrics.span("rate_wait"):
+                    allowed = self.governor.acquire(self.cancel_token)
+                if not allowed:
+                    reason = self.governor.exhausted_reason
+                    self.update_status(f"🛑 Stopping: {reason.replace('_', ' ')}")
+                    self.metrics.set_info("stop_reason", reason)
+                    break
 
-            while requests_sent < num_requests and self.is_running:
-                # Find "Connect" buttons
-                connect_buttons = self.driver.find_elements(By.XPATH, "//button[contains(., 'Connect')]")
+                attempt_started = time.monotonic()
+                try:
+                    outcome = retry.run(
+                        lambda: self.connect(card, discovery, note_template, retry),
+                        lambda failure_class: self.recover(failure_class, card, discovery),
+                    )
+                    if outcome == "card_gone":
+                        self.contacts.record(profile_id, contacts.SKIPPED)
+                        continue
+                    requests_sent += 1
+                    self.requests_sent = requests_sent
+                    self.governor.record_send()
+                    self.contacts.record(profile_id, contacts.SENT)
+                    self.checkpoint.save(search_query, num_requests, requests_sent, results.page_url, profile_id)
+                    self.update_status(f"📩 Progress: {requests_sent}/{num_requests} requests sent")
+                    self.sample_telemetry("action", profile_id=profile_id, outcome="sent")
+                    tripped = breaker.record(True)
 
-                if not connect_buttons:
-                    self.update_status("🔄 No Connect buttons found, scrolling...")
-                    for _ in range(3):  # Smooth short scrolls
-                        self.driver.execute_script("window.scrollBy(0, 300);")
-                        time.sleep(1)
+                except ConnectFailed as e:
+                    self.logger.error("Connect failed (%s): %s", e.failure_class, e.error,
+                                      extra={"phase": "connect", "profile_id": profile_id,
+                                             "failure_class": e.failure_class})
+                    self.metrics.event("connect_failed", error=type(e.error).__name__, failure_class=e.failure_class,
+                                       seconds=time.monotonic() - attempt_started)
+                    self.contacts.record(profile_id, contacts.FAILED)
+                    self.checkpoint.save(search_query, num_requests, requests_sent, results.page_url, profile_id)
+                    self.update_status(f"⚠️ Skipping a failed request ({e.failure_class.replace('_', ' ')})...")
+                    self.sample_telemetry("action", profile_id=profile_id, outcome="failed")
+                    tripped = breaker.record(False)
 
-                    time.sleep(2)  # Wait for elements to load
-                    continue  # Retry finding buttons
+                if tripped:
+                    if breaker.exhausted:
+                        self.update_status("🛑 Stopping: failures keep recurring after pauses")
+                        self.metrics.set_info("stop_reason", "circuit_open")
+                        break
+                    self.pause_for_breaker(breaker)
 
-                self.update_status(f"📌 Found {len(connect_buttons)} potential connections")
+                # Stop before the iterator scrolls for more cards we no longer need
+                if requests_sent >= num_requests or not self.is_running:
+                    break
 
-                for button in connect_buttons:
-                    if requests_sent >= num_requests or not self.is_running:
-                        break
+                if self.profiler:
+                    self.profiler.check()
+                recycle = self.watchdog.check(self.driver)
+                if recycle:
+                    self.recycle(results, *recycle)
+
+            if results.stop_reason and requests_sent < num_requests and self.is_running:
+                reason = results.stop_reason.replace("_", " ")
+                self.update_status(f"🏁 Search exhausted after page {results.page} ({reason})")
+                self.metrics.set_info("stop_reason", results.stop_reason)
+            # A finished search has nothing left to resume, even if it fell short
+            if requests_sent >= num_requests or results.stop_reason:
+                self.checkpoint.clear()
+            self.update_status(f"🎉 Successfully sent {requests_sent} connection requests!")
+            self.log_wait_timings()
+            self.finish_run()
+            self.is_running = False
+            return True
+
+        except Cancelled:
+            self.update_status(f"⏹️ Stopped after {self.requests_sent} connection requests")
+            self.finish_run()
+            self.is_running = False
+            return True
+
+        except Exception as e:
+            self.update_status(f"❌ Error in search and connect process: {e}")
+            self.logger.error("Search and connect error: %s", e, exc_info=True)
+            self.finish_run()
+            self.is_running = False
+            return False
+
+    def dry_run(self, search_query, export_path, max_pages=None, filters=None, export_format=None):
+        """Walk the search results and stream every card to export_path without
+        clicking anything. Reports candidates per page and pages per minute."""
+        if not self.driver:
+            self.update_status("⚠️ Browser not initialized. Please log in first.")
+            return False
 
-                    try:
-                        # Scroll to button smoothly
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                        time.sleep(1)
-
-                        # Click "Connect" button
-                        button.click()
-                        time.sleep(2)
-
-                        # Handle note if required
-                        if include_note:
-                            try:
-                                add_note_button = WebDriverWait(self.driver, 5).until(
-                                    EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Add a note')]"))
-                                )
-                                add_note_button.click()
-                                
-                                note_text = custom_note if custom_note else "Hi, I'd like to connect with you!"
-                                note_field = WebDriverWait(self.driver, 5).until(
-                                    EC.presence_of_element_located((By.XPATH, "//textarea[@name='message']"))
-                                )
-                                note_field.send_keys(note_text)
-
-                                send_button = WebDriverWait(self.driver, 5).until(
-                                    EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Send')]"))
-                                )
-                                send_button.click()
-                                self.update_status("✅ Sent request with note")
-                            except Exception as e:
-                                self.logger.warning(f"Note addition failed: {e}")
-                                send_button = self.driver.find_element(By.XPATH, "//button[contains(., 'Send')]")
-                                send_button.click()
-                                self.update_status("✅ Sent request without note (note addition failed)")
+        self.requests_sent = 0
+        self.requests_restored = 0
+        self.last_dry_run = None
+        self.cancel_token.reset()
+        self._stop_requested_at = None
+        self.is_running = True
+        self.start_profiler()
+        started = time.monotonic()
+        counts = {"cards": 0, "candidates": 0, "pending": 0, "contacted": 0}
+        page_candidates = []
+        try:
+            with CardExporter(export_path, export_format) as exporter:
+                self.open_search_results(search_query, filters)
+                self.sample_telemetry("navigation", page=page_from_url(self.driver.current_url))
+                discovery = CardDiscovery(self.driver)
+                results = ResultIterator(self.driver, self.waits, discovery, self.metrics,
+                                         max_pages=max_pages or DEFAULT_MAX_PAGES)
+                def page_done(stats):
+                    exporter.flush()
+                    candidates = counts["candidates"] - sum(page_candidates)
+                    page_candidates.append(candidates)
+                    self.metrics.event("dry_run_page", page=stats["page"], cards=stats["cards"],
+                                       candidates=candidates, seconds=stats["seconds"])
+                    self.update_status(
+                        f"📄 Page {stats['page']}: {candidates} candidates of {stats['cards']} cards "
+                        f"in {stats['seconds']:.1f}s"
+                    )
+
+                results.on_page_done = page_done
+                results.on_navigate = lambda page: self.sample_telemetry("navigation", page=page)
+
+                for card in results:
+                    self.cancel_token.check()
+                    # ResultIterator yields each card once per page, even across a reload
+                    profile_id = card["profile_id"]
+                    exporter.write(card, results.page)
+                    counts["cards"] += 1
+                    if card["button_state"] == "pending":
+                        counts["pending"] += 1
+                    elif card["button_state"] == "connect":
+                        if profile_id and self.contacts.should_skip(profile_id):
+                            counts["contacted"] += 1
                         else:
-                            send_button = self.driver.find_element(By.XPATH, "//button[contains(., 'Send')]")
-                            send_button.click()
-                            self.update_status("✅ Sent request without note")
+                            counts["candidates"] += 1
 
-                        requests_sent += 1
-                        self.update_status(f"📩 Progress: {requests_sent}/{num_requests} requests sent")
-                        time.sleep(3)
+                    if not self.is_running:
+                        break
+                    if self.profiler:
+                        self.profiler.check()
+                    recycle = self.watchdog.check(self.driver)
+                    if recycle:
+                        self.recycle(results, *recycle)
 
-                    except Exception as e:
-                        self.logger.error(f"⚠️ Error clicking 'Connect': {e}")
-                        self.update_status("⚠️ Skipping a failed request...")
-                        continue
+            report = self.dry_run_report(counts, page_candidates, started, export_path)
+            if results.stop_reason:
+                self.metrics.set_info("stop_reason", results.stop_reason)
+            self.update_status(
+                f"🔎 Dry run: {counts['candidates']} candidates on {report['pages']} pages "
+                f"({report['candidates_per_page']:.1f} per page, {report['pages_per_minute']:.1f} pages/min), "
+                f"exported to {export_path}"
+            )
+            self.finish_run()
+            self.is_running = False
+            return True
 
-            self.update_status(f"🎉 Successfully sent {requests_sent} connection requests!")
+        except Cancelled:
+            self.dry_run_report(counts, page_candidates, started, export_path)
+            self.update_status(f"⏹️ Dry run stopped after {counts['cards']} cards, exported to {export_path}")
+            self.finish_run()
             self.is_running = False
             return True
 
         except Exception as e:
-            self.update_status(f"❌ Error in search and connect process: {e}")
-            self.logger.error(f"Search and connect error: {e}")
+            self.update_status(f"❌ Error in dry run: {e}")
+            self.logger.error("Dry run error: %s", e, exc_info=True)
+            self.finish_run()
             self.is_running = False
             return False
 
+    def dry_run_report(self, counts, page_candidates, started, export_path):
+        """Sizing figures for a dry run over the pages finished so far"""
+        minutes = (time.monotonic() - started) / 60
+        pages = len(page_candidates)
+        report = {
+            **counts,
+            "pages": pages,
+            "export": export_path,
+            "candidates_per_page": counts["candidates"] / pages if pages else 0.0,
+            "pages_per_minute": pages / minutes if minutes else 0.0,
+            "candidates_per_minute": counts["candidates"] / minutes if minutes else 0.0,
+        }
+        self.last_dry_run = report
+        self.metrics.set_info("dry_run", report)
+        return report
+
+    def connect(self, card, discovery, note_template, retry):
+        """Make one attempt at inviting card; returns "sent" or "card_gone".
+        Timeouts are raised as StepTimeout so the retry engine can classify them."""
+        profile_id = card["profile_id"]
+        # Scroll to and click "Connect" in one round trip, then wait for the modal
+        with self.metrics.span("click", profile_id=profile_id):
+            outcome = discovery.click(card)
+            if outcome == "missing" and discovery.restamp(card):
+                # The list re-rendered and dropped the handle; the card itself is still there
+                outcome = discovery.click(card)
+            if outcome != "clicked":
+                self.metrics.event("card_gone", profile_id=profile_id, outcome=outcome)
+                return "card_gone"
+            self.step_wait("modal_open", self.waits.modal_open)
+
+        # Handle note if required
+        if note_template:
+            note_started = time.monotonic()
+            try:
+                with self.metrics.span("note_entry") as attrs:
+                    add_note_button = self.waits.add_note_button()
+                    add_note_button.click()
+                    
+                    note_text = note_template.render(card)
+                    note_field = self.waits.note_field()
+                    method, seconds = fill_note(self.driver, note_field, note_text)
+                    attrs["method"] = method
+                    self.metrics.record("note_typing", seconds, method=method, chars=len(note_text))
+
+                with self.metrics.span("send"):
+                    send_button = self.step_wait("send_enabled", self.waits.send_enabled)
+                    send_button.click()
+                self.update_status("✅ Sent request with note")
+            except Cancelled:
+                raise
+            except Exception as e:
+                self.logger.warning("Note addition failed: %s", e, extra={"phase": "note_entry", "profile_id": profile_id})
+                retry.record(NOTE_FAILED, time.monotonic() - note_started)
+                with self.metrics.span("error_recovery", cause="note"):
+                    send_button = self.step_wait("send_enabled", self.waits.send_enabled)
+                    send_button.click()
+                self.update_status("✅ Sent request without note (note addition failed)")
+        else:
+            with self.metrics.span("send"):
+                send_button = self.step_wait("send_enabled", self.waits.send_enabled)
+                send_button.click()
+            self.update_status("✅ Sent request without note")
+
+        # Only count the request once the modal confirms it went out
+        with self.metrics.span("send_confirm"):
+            self.step_wait("modal_closed", self.waits.modal_closed)
+        return "sent"
+
+    def step_wait(self, step, wait):
+        """Run a named wait, turning a timeout into a StepTimeout for that step"""
+        try:
+            return wait()
+        except StepTimeout:
+            raise
+        except TimeoutException as e:
+            raise StepTimeout(step) from e
+
+    def recover(self, failure_class, card, discovery):
+        """Put the page back into a known state after a failed connect attempt"""
+        with self.metrics.span("error_recovery", cause=failure_class):
+            self.dismiss_modal()
+            if failure_class == STALE:
+                discovery.restamp(card)
+
+    def dismiss_modal(self):
+        """Close an invitation modal left open by a failed attempt"""
+        try:
+            if not self.driver.find_elements(*locators.MODAL):
+                return
+            for button in self.driver.find_elements(*locators.DISMISS_BUTTON):
+                button.click()
+                break
+            self.waits.modal_closed()
+        except Cancelled:
+            raise
+        except Exception as e:
+            self.logger.warning("Could not dismiss the invitation modal: %s", e, extra={"phase": "error_recovery"})
+
+    def pause_for_breaker(self, breaker):
+        """Back off for the cooldown after the failure rate spiked"""
+        cooldown = self.retry_settings["breaker_cooldown"]
+        self.update_status(
+            f"⏸️ {breaker.tripped_rate:.0%} of recent requests failed, pausing for {cooldown / 60:.0f} min"
+        )
+        self.metrics.event("circuit_open", failure_rate=breaker.tripped_rate, trips=breaker.trips)
+        with self.metrics.span("circuit_pause"):
+            self.cancel_token.sleep(cooldown)
+
+    def open_search_results(self, search_query, filters=None):
+        """Open the People results, directly by URL when possible"""
+        if self.search_navigation == NAVIGATION_DIRECT:
+            if self.open_search_url(search_query, filters):
+                return
+            self.update_status("⚠️ Direct search failed, falling back to the search box")
+        elif filters:
+            self.logger.warning("Search filters are only applied with direct navigation")
+        self.search_with_typeahead(search_query)
+
+    def open_search_url(self, search_query, filters=None):
+        """Load the people-search results URL in one navigation"""
+        self.update_status(f"🔎 Opening results for '{search_query}'...")
+        with self.metrics.span("search_url"):
+            self.driver.get(people_search_url(self.base_url, search_query, filters))
+            try:
+                self.waits.results_loaded()
+            except TimeoutException:
+                self.logger.warning("Direct search results did not render in time")
+                return False
+        return PEOPLE_SEARCH_PATH in self.driver.current_url
+
+    def search_with_typeahead(self, search_query):
+        """Search with the typeahead and switch to the People results"""
+        self.update_status(f"🔎 Searching for '{search_query}'...")
+        with self.metrics.span("search_submit"):
+            search_box = self.waits.search_box()
+            search_box.clear()
+            search_box.send_keys(search_query)
+            search_box.send_keys(Keys.RETURN)
+
+        # Navigate to the People tab
+        self.update_status("📍 Navigating to People tab...")
+        with self.metrics.span("tab_navigation"):
+            try:
+                people_tab = self.waits.people_tab()
+                people_tab.click()
+            except Cancelled:
+                raise
+            except Exception as e:
+                self.update_status("⚠️ Could not find People tab, may already be on results")
+                self.logger.warning("People tab navigation: %s", e, extra={"phase": "tab_navigation"})
+
+            try:
+                self.waits.results_loaded()
+            except TimeoutException:
+                self.logger.warning("Search results did not render in time")
+
+    def resume_search_results(self, saved):
+        """Go straight back to the results page recorded in a checkpoint"""
+        self.update_status(
+            f"⏩ Resuming '{saved['search_query']}' on page {saved.get('page', 1)} "
+            f"({saved['requests_sent']} already sent)..."
+        )
+        with self.metrics.span("resume"):
+            self.driver.get(saved["results_url"])
+            try:
+                self.waits.results_loaded()
+            except TimeoutException:
+                self.logger.warning("Search results did not render in time")
+
+    def finish_run(self):
+        """Write the metrics summary for this run and start a fresh run"""
+        if self._stop_requested_at is not None:
+            self.last_stop_latency = time.monotonic() - self._stop_requested_at
+            self._stop_requested_at = None
+            self.metrics.record("stop_latency", self.last_stop_latency)
+            self.logger.info("Stopped %.0f ms after stop was requested", self.last_stop_latency * 1000,
+                             extra={"phase": "stop_latency"})
+        footprint = self.browser_footprint()
+        if footprint:
+            self.metrics.set_info("browser_footprint", footprint)
+        self.metrics.set_info("browser_mode", "lean" if self.lean else "default")
+        if self.driver:
+            self.watchdog.sample(self.driver)
+        memory = self.watchdog.high_water()
+        self.metrics.set_info("memory_high_water", memory)
+        self.logger.info(
+            "Memory high-water: browser %.0f MB, JS heap %.0f MB, %d tab / %d driver recycles",
+            memory["peak_rss_mb"], memory["peak_heap_mb"], memory["tab_recycles"], memory["driver_recycles"],
+            extra={"memory": memory},
+        )
+        self.watchdog.reset()
+        if self.profiler:
+            profile = self.profiler.finish(self.metrics_dir, self.metrics.run_id)
+            self.profiler = None
+            self.metrics.set_info("profile", profile)
+            self.logger.info("Profiled %d samples over %.1fs", profile["samples"], profile["seconds"],
+                             extra={"profile": profile})
+        for hook in self.summary_hooks:
+            try:
+                hook(self.metrics)
+            except Exception as e:
+                self.logger.warning("Summary hook failed: %s", e)
+        if self.retry:
+            self.metrics.set_info("failures", self.retry.summary())
+            self.retry = None
+        self.last_run_summary = self.metrics.finish()
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Run summary:\n%s", format_summary(self.last_run_summary))
+        if self.metrics.path:
+            self.logger.info("Run metrics written to %s", self.metrics.path)
+        self.metrics = RunMetrics(self.metrics_dir)
+        return self.last_run_summary
+
+    def recycle(self, results, kind, rss_mb, heap_mb):
+        """Swap in a fresh tab or driver and reopen the current results page"""
+        rss = f"{rss_mb:.0f} MB" if rss_mb is not None else "n/a"
+        heap = f"{heap_mb:.0f} MB" if heap_mb is not None else "n/a"
+        self.update_status(f"♻️ Recycling {kind} (browser {rss}, JS heap {heap})...")
+        self.metrics.event("recycle", kind=kind, rss_mb=rss_mb, heap_mb=heap_mb, page=results.page)
+        with self.metrics.span("recycle", kind=kind):
+            if kind == RECYCLE_DRIVER:
+                # Carry the session over in memory so no login is needed
+                cookies = self.driver.get_cookies()
+                try:
+                    self.driver.quit()
+                except Exception as e:
+                    self.logger.warning("Error quitting old driver: %s", e, extra={"phase": "recycle"})
+                    self.force_close()
+                self.driver = None
+                if not self.initialize_driver():
+                    raise RuntimeError("Could not restart the browser")
+                if not self.apply_cookies(cookies):
+                    raise RuntimeError("Session was lost while restarting the browser")
+                results.reload(self.driver, self.waits)
+            else:
+                old_handle = self.driver.current_window_handle
+                self.driver.switch_to.new_window("tab")
+                new_handle = self.driver.current_window_handle
+                self.driver.switch_to.window(old_handle)
+                self.driver.close()
+                self.driver.switch_to.window(new_handle)
+                # CDP settings belong to the old tab, so apply them again
+                if self.lean:
+                    apply_lean_blocking(self.driver)
+                if self.telemetry:
+                    self.telemetry.enable()
+                results.reload()
+        self.watchdog.record(kind)
+        self.sample_telemetry("navigation", page=results.page, recycled=kind)
+
+    def start_profiler(self):
+        """Begin profiling this run on the calling (automation) thread, if enabled"""
+        if not self.profile:
+            return
+        threads = {"automation": threading.get_ident(), **self.profile_threads}
+        self.profiler = RunProfiler(
+            threads,
+            window_seconds=self.profile.get("window_seconds", 0),
+            interval=self.profile.get("interval", 0.01),
+            use_cprofile=self.profile.get("cprofile", True),
+        )
+        self.profiler.start()
+
+    def sample_telemetry(self, label, **attrs):
+        """Record DevTools page metrics for the current run when telemetry is on"""
+        if self.telemetry:
+            self.telemetry.sample(self.metrics, label, **attrs)
+
+    def browser_footprint(self):
+        """Memory and CPU used by chromedriver and its Chrome processes, if measurable"""
+        if not self.driver:
+            return None
+        return browser_footprint(self.driver)
+
+    def log_wait_timings(self):
+        """Log how long each wait step actually took"""
+        if not self.waits:
+            return
+        for step, stats in sorted(self.waits.summary().items()):
+            self.logger.info(
+                "Wait '%s': %d waits, %d timeouts, mean %.2fs, max %.2fs",
+                step, stats["count"], stats["timeouts"], stats["mean"], stats["max"], extra={"phase": step},
+            )
+
     def stop(self):
-        """Stop the automation process"""
+        """Stop the automation process; any wait in progress is interrupted"""
+        if self.is_running and self._stop_requested_at is None:
+            self._stop_requested_at = time.monotonic()
         self.is_running = False
+        self.cancel_token.cancel()
         self.update_status("⏹️ Stopping automation...")
 
     def close(self):
         """Close the browser and clean up"""
+        self.contacts.close()
         if self.driver:
             self.update_status("🚪 Closing browser...")
             try:
@@ -195,3 +793,21 @@ class LinkedInBot:
                 self.update_status("✅ Browser closed")
             except Exception as e:
                 self.update_status(f"⚠️ Error closing browser: {e}")
+
+    def force_close(self):
+        """Kill chromedriver and its browser processes when quit() hangs"""
+        driver = self.driver
+        try:
+            root_pid = driver.service.process.pid
+        except AttributeError:
+            return
+        if hasattr(signal, "SIGKILL"):
+            # Children first, so Chrome does not outlive chromedriver
+            for pid in reversed(process_tree(root_pid)):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+        else:
+            driver.service.process.kill()
+        self.driver = None
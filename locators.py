@@ -0,0 +1,20 @@
+from selenium.webdriver.common.by import By
+
+# Login page
+USERNAME_FIELD = (By.ID, "username")
+PASSWORD_FIELD = (By.ID, "password")
+LOGIN_BUTTON = (By.XPATH, "//button[@type='submit']")
+GLOBAL_NAV = (By.CLASS_NAME, "global-nav")
+
+# Search
+SEARCH_BOX = (By.XPATH, "//input[contains(@class, 'search-global-typeahead__input')]")
+PEOPLE_TAB = (By.XPATH, "//button[contains(., 'People')]")
+RESULT_CARD = (By.CSS_SELECTOR, "li.reusable-search__result-container")
+
+# Connect modal
+CONNECT_BUTTON = (By.XPATH, "//button[contains(., 'Connect')]")
+MODAL = (By.XPATH, "//div[@role='dialog']")
+ADD_NOTE_BUTTON = (By.XPATH, "//button[contains(., 'Add a note')]")
+NOTE_FIELD = (By.XPATH, "//textarea[@name='message']")
+SEND_BUTTON = (By.XPATH, "//button[contains(., 'Send')]")
+DISMISS_BUTTON = (By.XPATH, "//div[@role='dialog']//button[@aria-label='Dismiss']")
@@ -0,0 +1,140 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "linkedin_bot.jsonl")
+
+# Override with the "logging" section of linkedin_settings.json
+DEFAULT_LOGGING = {
+    "file": LOG_FILE,
+    "rotate": "size",          # "size" or "time"
+    "max_bytes": 5 * 1024 * 1024,
+    "when": "midnight",        # used when rotate is "time"
+    "backup_count": 10,
+    "compress": True,
+    "console": True,
+    "levels": {
+        "linkedin_bot": "INFO",
+        "telemetry": "WARNING",
+    },
+}
+
+# Attributes every LogRecord has; anything else came in through extra=
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        """One JSON object per record, with run_id, phase, profile_id etc. from extra="""
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    def prepare(self, record):
+        """Enqueue the record untouched. The stock handler formats the message
+        here, on the caller's thread; the listener does it instead."""
+        return record
+
+
+class RunLogger(logging.LoggerAdapter):
+    def __init__(self, logger, run_id):
+        """Logger that tags every record with the current run id; run_id is a callable"""
+        super().__init__(logger, {})
+        self.run_id = run_id
+
+    def process(self, msg, kwargs):
+        kwargs["extra"] = {"run_id": self.run_id(), **kwargs.get("extra", {})}
+        return msg, kwargs
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _file_handler(config):
+    os.makedirs(os.path.dirname(config["file"]) or ".", exist_ok=True)
+    if config["rotate"] == "time":
+        handler = TimedRotatingFileHandler(config["file"], when=config["when"],
+                                           backupCount=config["backup_count"], encoding="utf-8")
+    else:
+        handler = RotatingFileHandler(config["file"], maxBytes=config["max_bytes"],
+                                      backupCount=config["backup_count"], encoding="utf-8")
+    if config["compress"]:
+        handler.namer = lambda name: name + ".gz"
+        handler.rotator = _gzip_rotator
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def configure_logging(settings=None):
+    """Route all logging through a queue to a background writer. Only the
+    first call in a process has any effect; later calls return False."""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return False
+        config = dict(DEFAULT_LOGGING)
+        config.update(settings or {})
+        config["levels"] = {**DEFAULT_LOGGING["levels"], **(settings or {}).get("levels", {})}
+
+        handlers = []
+        if config["file"]:
+            handlers.append(_file_handler(config))
+        if config["console"]:
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", "%Y-%m-%d %H:%M:%S"))
+            handlers.append(console)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        _queue_handler = DeferredQueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        root.setLevel(logging.WARNING)
+        for name, level in config["levels"].items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return True
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,6 +1,10 @@
+import os
 import sys
 import traceback
 
+# Set by startup.py to measure time to first paint; the app exits right after painting
+STARTUP_PROBE_ENV = "LINKEDIN_STARTUP_PROBE"
+
 def main():
     """Initialize and run the LinkedIn Automation Tool with error handling"""
     try:
@@ -14,6 +18,12 @@ def main():
         # Handle window closing
         root.protocol("WM_DELETE_WINDOW", app.on_closing)
         
+        if os.environ.get(STARTUP_PROBE_ENV):
+            root.update()
+            print("FIRST_PAINT", flush=True)
+            root.destroy()
+            return
+        
         # Start the application
         print("Starting LinkedIn Automation Tool...")
         root.mainloop()
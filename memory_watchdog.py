@@ -0,0 +1,74 @@
+from browser import browser_footprint
+
+# Override with the "memory_limits" section of linkedin_settings.json.
+# A limit of 0 or None disables that check.
+DEFAULT_MEMORY_LIMITS = {
+    "browser_rss_mb": 1500,
+    "js_heap_mb": 400,
+    "check_every": 5,
+}
+
+# What to recycle when a limit is crossed: a bloated tab only needs a fresh
+# tab, but a bloated browser needs a fresh driver
+RECYCLE_TAB = "tab"
+RECYCLE_DRIVER = "driver"
+
+JS_HEAP_JS = "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+class MemoryWatchdog:
+    def __init__(self, limits=None):
+        """Sample browser and tab memory every few actions and decide when to recycle"""
+        self.limits = dict(DEFAULT_MEMORY_LIMITS)
+        self.limits.update(limits or {})
+        self.actions = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new run: forget the high-water marks"""
+        self.peak_rss_mb = 0.0
+        self.peak_heap_mb = 0.0
+        self.recycles = {RECYCLE_TAB: 0, RECYCLE_DRIVER: 0}
+
+    def sample(self, driver):
+        """Browser RSS (from /proc) and tab JS heap in MB; either may be None"""
+        footprint = browser_footprint(driver)
+        rss_mb = footprint["rss_mb"] if footprint else None
+        try:
+            heap = driver.execute_script(JS_HEAP_JS)
+        except Exception:
+            heap = None
+        heap_mb = heap / (1024 * 1024) if heap else None
+
+        if rss_mb is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        if heap_mb is not None:
+            self.peak_heap_mb = max(self.peak_heap_mb, heap_mb)
+        return rss_mb, heap_mb
+
+    def check(self, driver):
+        """Call after every connect action. Returns (kind, rss_mb, heap_mb) when
+        the tab or driver should be recycled, otherwise None."""
+        self.actions += 1
+        if not self.limits["check_every"] or self.actions % self.limits["check_every"]:
+            return None
+        rss_mb, heap_mb = self.sample(driver)
+        rss_limit = self.limits["browser_rss_mb"]
+        heap_limit = self.limits["js_heap_mb"]
+        if rss_limit and rss_mb is not None and rss_mb > rss_limit:
+            return RECYCLE_DRIVER, rss_mb, heap_mb
+        if heap_limit and heap_mb is not None and heap_mb > heap_limit:
+            return RECYCLE_TAB, rss_mb, heap_mb
+        return None
+
+    def record(self, kind):
+        self.recycles[kind] += 1
+
+    def high_water(self):
+        """Peak memory seen this run and how often each recycle happened"""
+        return {
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "peak_heap_mb": round(self.peak_heap_mb, 1),
+            "tab_recycles": self.recycles[RECYCLE_TAB],
+            "driver_recycles": self.recycles[RECYCLE_DRIVER],
+        }
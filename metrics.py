@@ -0,0 +1,207 @@
+from contextlib import contextmanager
+import json
+import math
+import os
+import threading
+import time
+import uuid
+
+METRICS_DIR = "metrics"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100.0 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+class RunMetrics:
+    def __init__(self, metrics_dir=METRICS_DIR, run_id=None):
+        """Collect named timing spans for one run and stream them to JSONL"""
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self.metrics_dir = metrics_dir
+        self.path = os.path.join(metrics_dir, f"run-{self.run_id}.jsonl") if metrics_dir else None
+        self.durations = {}
+        self.failures = {}
+        self.events = {}
+        self.info = {}
+        self.samples = {}
+        self.started = time.time()
+        self._file = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, phase, **attrs):
+        """Time the enclosed block and record it under phase"""
+        start = time.time()
+        t0 = time.monotonic()
+        ok = True
+        try:
+            yield attrs
+        except BaseException as e:
+            ok = False
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            self.record(phase, time.monotonic() - t0, ok=ok, start=start, **attrs)
+
+    def record(self, phase, duration, ok=True, start=None, **attrs):
+        """Record a span that was timed elsewhere"""
+        with self._lock:
+            self.durations.setdefault(phase, []).append(duration)
+            if not ok:
+                self.failures[phase] = self.failures.get(phase, 0) + 1
+        self._write({
+            "type": "span",
+            "run_id": self.run_id,
+            "phase": phase,
+            "start": start if start is not None else time.time() - duration,
+            "duration": duration,
+            "ok": ok,
+            **attrs,
+        })
+
+    def event(self, name, **attrs):
+        """Record a point-in-time event such as a skipped candidate"""
+        with self._lock:
+            self.events[name] = self.events.get(name, 0) + 1
+        self._write({"type": "event", "run_id": self.run_id, "name": name, "time": time.time(), **attrs})
+
+    def telemetry(self, label, values, **attrs):
+        """Record a page-side sample, such as JS heap size or DOM node count, under label"""
+        with self._lock:
+            series = self.samples.setdefault(label, {})
+            for key, value in values.items():
+                if isinstance(value, (int, float)):
+                    series.setdefault(key, []).append(value)
+        self._write({"type": "telemetry", "run_id": self.run_id, "label": label, "time": time.time(),
+                     **attrs, "values": values})
+
+    def set_info(self, key, value):
+        """Attach a run-level value, such as the browser footprint, to the summary"""
+        with self._lock:
+            self.info[key] = value
+
+    def summary(self):
+        """Return count, failures, total, p50, p95 and max per phase"""
+        with self._lock:
+            phases = {
+                phase: {
+                    "count": len(samples),
+                    "failures": self.failures.get(phase, 0),
+                    "total": sum(samples),
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "max": max(samples),
+                }
+                for phase, samples in self.durations.items()
+            }
+            telemetry = {
+                label: {
+                    key: {"p50": percentile(samples, 50), "max": max(samples), "total": sum(samples)}
+                    for key, samples in series.items()
+                }
+                for label, series in self.samples.items()
+            }
+            samples = {label: max((len(s) for s in series.values()), default=0)
+                       for label, series in self.samples.items()}
+            summary = {
+                "run_id": self.run_id,
+                "wall_time": time.time() - self.started,
+                "phases": phases,
+                "events": dict(self.events),
+                "info": dict(self.info),
+            }
+            if telemetry:
+                summary["telemetry"] = telemetry
+                summary["telemetry_samples"] = samples
+            return summary
+
+    def finish(self):
+        """Write the run summary and close the metrics file"""
+        summary = self.summary()
+        self._write({"type": "summary", **summary})
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        return summary
+
+    def _write(self, record):
+        if not self.path:
+            return
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.metrics_dir, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+
+def format_summary(summary):
+    """Render a run summary as a fixed-width text table"""
+    lines = [f"{'Phase':<20}{'Count':>7}{'Total s':>10}{'p50 s':>9}{'p95 s':>9}{'Max s':>9}"]
+    for phase, stats in sorted(summary["phases"].items(), key=lambda item: -item[1]["total"]):
+        lines.append(
+            f"{phase:<20}{stats['count']:>7}{stats['total']:>10.2f}"
+            f"{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['max']:>9.2f}"
+        )
+    lines.append(f"Wall time: {summary['wall_time']:.1f}s")
+    footprint = summary.get("info", {}).get("browser_footprint")
+    if footprint:
+        mode = summary["info"].get("browser_mode", "default")
+        lines.append(
+            f"Browser ({mode}): {footprint['rss_mb']:.0f} MB RSS, "
+            f"{footprint['cpu_seconds']:.1f}s CPU across {footprint['processes']} processes"
+        )
+    failures = summary.get("info", {}).get("failures")
+    if failures:
+        lines.append(f"{'Failure class':<20}{'Fails':>7}{'Retries':>9}{'Recov.':>8}{'Lost s':>9}")
+        for failure_class, stats in sorted(failures.items(), key=lambda item: -item[1]["seconds_lost"]):
+            lines.append(
+                f"{failure_class:<20}{stats['failures']:>7}{stats['retries']:>9}"
+                f"{stats['recovered']:>8}{stats['seconds_lost']:>9.2f}"
+            )
+    dry_run = summary.get("info", {}).get("dry_run")
+    if dry_run:
+        lines.append(
+            f"Dry run: {dry_run['candidates']} candidates of {dry_run['cards']} cards on {dry_run['pages']} pages, "
+            f"{dry_run['candidates_per_page']:.1f} per page, {dry_run['pages_per_minute']:.1f} pages/min"
+        )
+    profile = summary.get("info", {}).get("profile")
+    if profile:
+        where = profile.get("collapsed", "in memory only")
+        lines.append(f"Profile: {profile['samples']} samples over {profile['seconds']:.1f}s -> {where}")
+        for entry in profile.get("top_cumulative", [])[:5]:
+            lines.append(f"  {entry}")
+    lag = summary.get("info", {}).get("ui_lag")
+    if lag:
+        lines.append(
+            f"UI lag: p50 {lag['p50_ms']:.0f} ms, p95 {lag['p95_ms']:.0f} ms, p99 {lag['p99_ms']:.0f} ms, "
+            f"max {lag['max_ms']:.0f} ms, {lag['blocks']} blocks"
+        )
+    memory = summary.get("info", {}).get("memory_high_water")
+    if memory:
+        lines.append(
+            f"Memory high-water: browser {memory['peak_rss_mb']:.0f} MB, JS heap {memory['peak_heap_mb']:.0f} MB "
+            f"({memory['tab_recycles']} tab, {memory['driver_recycles']} driver recycles)"
+        )
+    for label, stats in sorted(summary.get("telemetry", {}).items()):
+        line = f"Page ({label}, {summary['telemetry_samples'][label]} samples):"
+        if "js_heap_used_mb" in stats:
+            heap = stats["js_heap_used_mb"]
+            line += f" heap p50 {heap['p50']:.1f} MB, max {heap['max']:.1f} MB;"
+        if "dom_nodes" in stats:
+            line += f" nodes max {stats['dom_nodes']['max']:.0f};"
+        if "long_tasks" in stats:
+            line += f" {stats['long_tasks']['total']:.0f} long tasks ({stats['long_task_ms']['total']:.0f} ms);"
+        if "task_s" in stats:
+            line += f" main thread {stats['task_s']['total']:.1f}s;"
+        if "load_ms" in stats:
+            line += f" load p50 {stats['load_ms']['p50']:.0f} ms"
+        lines.append(line.rstrip(";"))
+    return "\n".join(lines)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the parts of LinkedIn the bot touches.
+Serves a login form, a feed with the global nav and search box, and a
+paginated people-search page whose cards lazy-load in batches and open
+the same Connect / Add a note / Send modal the bot expects.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote_plus
+import argparse
+import html
+import json
+import random
+import threading
+import time
+
+SESSION_COOKIE = "li_mock_session"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+li.reusable-search__result-container {{ height: 160px; border-bottom: 1px solid #ddd; list-style: none; }}
+div[role=dialog] {{ position: fixed; top: 30%; left: 30%; background: #fff; border: 1px solid #333; padding: 16px; }}
+</style></head>
+<body>{nav}{body}<script>{script}</script></body></html>"""
+
+NAV = """<nav class="global-nav">
+<input class="search-global-typeahead__input" type="text" placeholder="Search">
+</nav>"""
+
+NAV_SCRIPT = """
+document.querySelector('.search-global-typeahead__input').addEventListener('keydown', function (e) {
+    if (e.key === 'Enter') {
+        window.location = '/search/results/all/?keywords=' + encodeURIComponent(this.value);
+    }
+});
+"""
+
+LOGIN_BODY = """<form method="post" action="/login">
+<input id="username" name="session_key" type="text">
+<input id="password" name="session_password" type="password">
+<button type="submit">Sign in</button>
+</form>"""
+
+# Cards are rendered client-side in batches so that scrolling is what
+# reveals them, like the real results page.
+RESULTS_SCRIPT = """
+var CARDS = {cards};
+var BATCH = {batch_size};
+var UI_DELAY = {ui_delay_ms};
+var shown = 0, loading = false, current = null;
+var list = document.getElementById('results');
+
+function esc(s) {{ var d = document.createElement('div'); d.innerText = s; return d.innerHTML; }}
+
+function renderBatch() {{
+    CARDS.slice(shown, shown + BATCH).forEach(function (c) {{
+        var li = document.createElement('li');
+        li.className = 'reusable-search__result-container';
+        li.setAttribute('data-profile-id', c.id);
+        li.innerHTML =
+            '<span class="entity-result__title-text"><a href="/in/' + c.id + '/"><span aria-hidden="true">' + esc(c.name) + '</span></a></span>' +
+            '<div class="entity-result__primary-subtitle">' + esc(c.headline) + '</div>' +
+            '<div class="entity-result__secondary-subtitle">' + esc(c.location) + '</div>' +
+            (c.pending ? '<button disabled aria-label="Pending">Pending</button>'
+                       : '<button aria-label="Invite ' + esc(c.name) + ' to connect">Connect</button>');
+        var btn = li.querySelector('button');
+        if (!c.pending) {{ btn.addEventListener('click', function () {{ openModal(c, btn); }}); }}
+        list.appendChild(li);
+    }});
+    shown = Math.min(shown + BATCH, CARDS.length);
+    if (shown >= CARDS.length) {{ document.getElementById('pagination').style.display = 'block'; }}
+}}
+
+window.addEventListener('scroll', function () {{
+    if (loading || shown >= CARDS.length) {{ return; }}
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {{
+        loading = true;
+        setTimeout(function () {{ renderBatch(); loading = false; }}, UI_DELAY);
+    }}
+}});
+
+function openModal(c, btn) {{
+    if (c.fail) {{ return; }}
+    current = {{card: c, button: btn}};
+    setTimeout(function () {{
+        var dlg = document.createElement('div');
+        dlg.setAttribute('role', 'dialog');
+        dlg.innerHTML = '<p>You can add a note to personalize your invitation.</p>' +
+            '<button id="add-note">Add a note</button> <button id="send">Send</button>';
+        document.body.appendChild(dlg);
+        dlg.querySelector('#add-note').addEventListener('click', function () {{
+            var ta = document.createElement('textarea');
+            ta.name = 'message';
+            dlg.insertBefore(ta, dlg.querySelector('#send'));
+            this.remove();
+        }});
+        dlg.querySelector('#send').addEventListener('click', function () {{
+            var ta = dlg.querySelector('textarea[name=message]');
+            fetch('/api/invite', {{method: 'POST', body: JSON.stringify({{profile_id: c.id, note: ta ? ta.value : ''}})}})
+                .then(function () {{
+                    setTimeout(function () {{
+                        dlg.remove();
+                        btn.innerText = 'Pending';
+                        btn.disabled = true;
+                        c.pending = true;
+                    }}, UI_DELAY);
+                }});
+        }});
+    }}, UI_DELAY);
+}}
+
+renderBatch();
+"""
+
+
+class MockLinkedIn:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, ui_latency=0.05,
+                 total_results=100, page_size=10, batch_size=5, failure_rate=0.0, seed=0):
+        """Configure the mock site; port 0 picks a free port"""
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.ui_latency = ui_latency
+        self.total_results = total_results
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.failure_rate = failure_rate
+        self.seed = seed
+
+        self.invites = []
+        self.invited_ids = set()
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def start(self):
+        """Start serving in a background thread and return the base URL"""
+        site = self
+
+        class Handler(MockHandler):
+            pass
+        Handler.site = site
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Shut the server down"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def reset(self):
+        """Forget all invitations received so far"""
+        with self.lock:
+            self.invites = []
+            self.invited_ids = set()
+
+    def record_invite(self, profile_id, note):
+        with self.lock:
+            self.invites.append({"profile_id": profile_id, "note": note, "time": time.time()})
+            self.invited_ids.add(profile_id)
+
+    def cards_for_page(self, keywords, page):
+        """Return the result cards for one results page"""
+        start = (page - 1) * self.page_size
+        end = min(start + self.page_size, self.total_results)
+        rng = random.Random(f"{self.seed}:{keywords}")
+        failing = {i for i in range(self.total_results) if rng.random() < self.failure_rate}
+        cards = []
+        for i in range(start, end):
+            profile_id = f"mock-person-{i}"
+            cards.append({
+                "id": profile_id,
+                "name": f"Person {i}",
+                "headline": f"{keywords.title() or 'Professional'} at Company {i % 17}",
+                "location": ["Berlin", "London", "New York", "Bangalore"][i % 4],
+                "pending": profile_id in self.invited_ids,
+                "fail": i in failing,
+            })
+        return cards
+
+    @property
+    def num_pages(self):
+        return max(1, -(-self.total_results // self.page_size))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    site = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body="", content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        headers = dict(headers or {})
+        headers["Location"] = location
+        self._send(302, headers=headers)
+
+    def _logged_in(self):
+        return f"{SESSION_COOKIE}=" in self.headers.get("Cookie", "")
+
+    def _page(self, title, body, script="", nav=True):
+        return PAGE_TEMPLATE.format(
+            title=title,
+            nav=NAV if nav else "",
+            body=body,
+            script=(NAV_SCRIPT if nav else "") + script,
+        )
+
+    def do_GET(self):
+        time.sleep(self.site.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/login":
+            self._send(200, self._page("Login", LOGIN_BODY, nav=False))
+            return
+        if url.path in ("", "/"):
+            self._send(200, self._page("LinkedIn", "", nav=False))
+            return
+        if not self._logged_in():
+            self._redirect("/login")
+            return
+
+        keywords = query.get("keywords", [""])[0]
+        if url.path == "/feed/":
+            self._send(200, self._page("Feed", "<main>Feed</main>"))
+        elif url.path == "/search/results/all/":
+            people = f"/search/results/people/?keywords={quote_plus(keywords)}"
+            body = f"<button onclick=\"window.location='{people}'\">People</button><main>All results</main>"
+            self._send(200, self._page("Search", body))
+        elif url.path == "/search/results/people/":
+            self._send(200, self._results_page(keywords, query))
+        elif url.path.startswith("/in/"):
+            self._send(200, self._page("Profile", f"<main>{html.escape(url.path)}</main>"))
+        else:
+            self._send(404, "Not found", "text/plain")
+
+    def _results_page(self, keywords, query):
+        site = self.site
+        try:
+            page = max(1, int(query.get("page", ["1"])[0]))
+        except ValueError:
+            page = 1
+        cards = site.cards_for_page(keywords, page)
+        base = f"/search/results/people/?keywords={quote_plus(keywords)}"
+        prev_button = (f"<button aria-label=\"Previous\" onclick=\"window.location='{base}&page={page - 1}'\">Previous</button>"
+                       if page > 1 else "<button aria-label=\"Previous\" disabled>Previous</button>")
+        next_button = (f"<button aria-label=\"Next\" onclick=\"window.location='{base}&page={page + 1}'\">Next</button>"
+                       if page < site.num_pages else "<button aria-label=\"Next\" disabled>Next</button>")
+        body = ("<button>People</button>"
+                "<ul class=\"reusable-search__entity-result-list\" id=\"results\"></ul>"
+                f"<div id=\"pagination\" class=\"artdeco-pagination\" style=\"display:none\">{prev_button}"
+                f"<span class=\"artdeco-pagination__page-state\">Page {page} of {site.num_pages}</span>{next_button}</div>")
+        script = RESULTS_SCRIPT.format(
+            cards=json.dumps(cards).replace("</", "<\\/"),
+            batch_size=site.batch_size,
+            ui_delay_ms=int(site.ui_latency * 1000),
+        )
+        return self._page("People", body, script)
+
+    def do_POST(self):
+        time.sleep(self.site.latency)
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        payload = self.rfile.read(length).decode("utf-8") if length else ""
+
+        if url.path == "/login":
+            fields = parse_qs(payload)
+            if fields.get("session_key", [""])[0] and fields.get("session_password", [""])[0]:
+                cookie = f"{SESSION_COOKIE}=1; Path=/"
+                self._redirect("/feed/", headers={"Set-Cookie": cookie})
+            else:
+                self._redirect("/login?error=1")
+        elif url.path == "/api/invite":
+            try:
+                data = json.loads(payload or "{}")
+            except ValueError:
+                data = {}
+            self.site.record_invite(data.get("profile_id"), data.get("note", ""))
+            self._send(200, "{}", "application/json")
+        else:
+            self._send(404, "Not found", "text/plain")
+
+
+def main():
+    """Serve the mock site until interrupted"""
+    parser = argparse.ArgumentParser(description="Serve an offline mock of LinkedIn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="server delay per request (s)")
+    parser.add_argument("--ui-latency", type=float, default=0.05, help="client-side delay for modals and batches (s)")
+    parser.add_argument("--results", type=int, default=100)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    site = MockLinkedIn(port=args.port, latency=args.latency, ui_latency=args.ui_latency,
+                        total_results=args.results, failure_rate=args.failure_rate)
+    print(f"Mock LinkedIn running at {site.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
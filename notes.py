@@ -0,0 +1,87 @@
+from string import Formatter
+import time
+
+DEFAULT_NOTE = "Hi, I'd like to connect with you!"
+
+# LinkedIn rejects invitation notes longer than this
+NOTE_MAX_LENGTH = 300
+
+# Placeholders a note template may use, and what to write when the card
+# does not provide a value
+PLACEHOLDERS = {
+    "first_name": "there",
+    "last_name": "",
+    "full_name": "",
+    "headline": "",
+    "company": "your company",
+    "location": "",
+}
+
+# Set the textarea's value through the native setter so framework-managed
+# inputs see the change, then fire the events their listeners wait for.
+# Returns the value the page ended up with so the caller can validate it.
+FILL_NOTE_JS = """
+var el = arguments[0], text = arguments[1];
+var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, text);
+el.dispatchEvent(new Event('input', {bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+return el.value;
+"""
+
+
+def card_fields(card):
+    """Placeholder values for one result card from discovery"""
+    name = (card.get("name") or "").strip()
+    parts = name.split()
+    headline = (card.get("headline") or "").strip()
+    company = ""
+    for separator in (" at ", " @ "):
+        if separator in headline:
+            company = headline.rsplit(separator, 1)[1].strip()
+            break
+    return {
+        "first_name": parts[0] if parts else "",
+        "last_name": parts[-1] if len(parts) > 1 else "",
+        "full_name": name,
+        "headline": headline,
+        "company": company,
+        "location": (card.get("location") or "").strip(),
+    }
+
+
+class NoteTemplate:
+    def __init__(self, template):
+        """Parse a note such as "Hi {first_name}!" once; raises ValueError on unknown placeholders"""
+        self.template = template
+        self.parts = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field is not None and field not in PLACEHOLDERS:
+                known = ", ".join("{" + name + "}" for name in PLACEHOLDERS)
+                raise ValueError(f"Unknown placeholder {{{field}}} in note (use {known})")
+            self.parts.append((literal, field))
+        self.fields = [field for _, field in self.parts if field]
+
+    def render(self, card):
+        """Fill the template from a card, trimmed to LinkedIn's note limit"""
+        values = card_fields(card) if self.fields else {}
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field:
+                out.append(values.get(field) or PLACEHOLDERS[field])
+        return "".join(out)[:NOTE_MAX_LENGTH]
+
+
+def fill_note(driver, element, text):
+    """Enter text into the note field in one call, falling back to send_keys
+    if the page did not take the value. Returns (method, seconds)."""
+    t0 = time.monotonic()
+    try:
+        if driver.execute_script(FILL_NOTE_JS, element, text) == text:
+            return "js", time.monotonic() - t0
+    except Exception:
+        pass
+    element.clear()
+    element.send_keys(text)
+    return "send_keys", time.monotonic() - t0
@@ -0,0 +1,125 @@
+from collections import Counter
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 0.01
+
+
+class StackSampler:
+    def __init__(self, threads, interval=DEFAULT_INTERVAL):
+        """Sample the Python stacks of the named threads ({name: ident}) from a background thread"""
+        self.threads = dict(threads)
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for name, ident in self.threads.items():
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    stack.append(name)
+                    self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path):
+        """Write "frame;frame;frame count" lines, as read by flamegraph.pl and speedscope"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    def __init__(self, threads, window_seconds=0, interval=DEFAULT_INTERVAL, use_cprofile=True):
+        """Profile one run: stack sampling of every thread in threads plus cProfile
+        of the thread that calls start(). window_seconds > 0 limits profiling
+        to the start of the run."""
+        self.sampler = StackSampler(threads, interval)
+        self.window_seconds = window_seconds
+        self.use_cprofile = use_cprofile
+        self.cprofile = None
+        self.started = None
+        self.stopped = None
+        self.logger = logging.getLogger("profiler")
+
+    def start(self):
+        """Start sampling; call on the automation thread so cProfile covers it"""
+        self.started = time.monotonic()
+        self.sampler.start()
+        if self.use_cprofile:
+            self.cprofile = cProfile.Profile()
+            try:
+                self.cprofile.enable()
+            except ValueError as e:
+                # Another profiler (or debugger) already owns the hook
+                self.logger.warning("cProfile unavailable: %s", e)
+                self.cprofile = None
+
+    def check(self):
+        """Stop collecting once the window has passed; call from the automation thread"""
+        if self.window_seconds and self.stopped is None and time.monotonic() - self.started >= self.window_seconds:
+            self._stop_collecting()
+
+    def _stop_collecting(self):
+        if self.cprofile:
+            self.cprofile.disable()
+        self.sampler.stop()
+        self.stopped = time.monotonic()
+
+    def finish(self, output_dir, run_id, top=10):
+        """Stop profiling and write <run>.collapsed.txt and <run>.pstats to output_dir.
+        Returns a summary for the run metrics."""
+        if self.stopped is None:
+            self._stop_collecting()
+        summary = {
+            "samples": self.sampler.samples,
+            "seconds": round(self.stopped - self.started, 2),
+            "interval": self.sampler.interval,
+        }
+        if self.cprofile:
+            stats = pstats.Stats(self.cprofile)
+            summary["top_cumulative"] = [
+                f"{os.path.basename(filename)}:{line}({name}) {entry[3]:.3f}s"
+                for (filename, line, name), entry in sorted(
+                    stats.stats.items(), key=lambda item: -item[1][3])[:top]
+            ]
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            collapsed = os.path.join(output_dir, f"run-{run_id}.collapsed.txt")
+            self.sampler.write_collapsed(collapsed)
+            summary["collapsed"] = collapsed
+            if self.cprofile:
+                path = os.path.join(output_dir, f"run-{run_id}.pstats")
+                self.cprofile.dump_stats(path)
+                summary["pstats"] = path
+        return summary
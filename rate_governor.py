@@ -0,0 +1,157 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+BUDGET_FILE = "linkedin_budget.json"
+
+DAY = 24 * 3600
+WEEK = 7 * DAY
+
+# Conservative daily and weekly defaults; override with the "rate_limits"
+# section of linkedin_settings.json. A limit of 0 or None means unlimited.
+# Hourly pacing (per_hour with a bucket of burst sends) is off unless set.
+DEFAULT_RATE_LIMITS = {
+    "daily": 25,
+    "weekly": 100,
+    "per_hour": 0,
+    "burst": 0,
+}
+UNLIMITED = {"daily": 0, "weekly": 0, "per_hour": 0, "burst": 0}
+
+DAILY_EXHAUSTED = "daily_budget_exhausted"
+WEEKLY_EXHAUSTED = "weekly_budget_exhausted"
+
+
+class RateGovernor:
+    def __init__(self, path=BUDGET_FILE, limits=None):
+        """Token bucket plus rolling daily and weekly budgets, persisted across runs"""
+        self.path = path
+        self.limits = dict(DEFAULT_RATE_LIMITS)
+        self.limits.update(limits or {})
+        self.sends = []
+        self.tokens = float(self.limits["burst"] or 0)
+        self.updated = time.time()
+        self.exhausted_reason = None
+        self._lock = threading.Lock()
+        self.load()
+
+    @property
+    def refill_rate(self):
+        """Tokens per second, or 0 if the bucket is disabled"""
+        return (self.limits["per_hour"] or 0) / 3600.0
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        cutoff = time.time() - WEEK
+        self.sends = sorted(t for t in state.get("sends", []) if t > cutoff)
+        self.tokens = min(float(state.get("tokens", self.tokens)), float(self.limits["burst"] or 0))
+        self.updated = state.get("updated", self.updated)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sends": self.sends, "tokens": self.tokens, "updated": self.updated}, f)
+        os.replace(tmp_path, self.path)
+
+    def _refill(self, now):
+        if self.refill_rate:
+            capacity = float(self.limits["burst"] or 1)
+            self.tokens = min(capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def _window_count(self, sends, now, window):
+        return len(sends) - bisect.bisect_right(sends, now - window)
+
+    def _earliest(self, sends, tokens, now):
+        """(earliest send time, exhausted reason) given the sends so far and the
+        tokens available at now; the reason is set when a budget is the limit"""
+        ready, reason = now, None
+        for limit_key, window, exhausted in (("daily", DAY, DAILY_EXHAUSTED), ("weekly", WEEK, WEEKLY_EXHAUSTED)):
+            limit = self.limits[limit_key]
+            if limit and self._window_count(sends, now, window) >= limit:
+                # The budget frees up when the limit-th most recent send ages out
+                frees_at = sends[len(sends) - limit] + window
+                if frees_at > ready:
+                    ready, reason = frees_at, exhausted
+        if self.refill_rate and tokens < 1:
+            ready = max(ready, now + (1 - tokens) / self.refill_rate)
+        return ready, reason
+
+    def remaining(self):
+        """Sends left in the rolling day and week (None when unlimited)"""
+        with self._lock:
+            now = time.time()
+            result = {}
+            for limit_key, window in (("daily", DAY), ("weekly", WEEK)):
+                limit = self.limits[limit_key]
+                result[limit_key] = max(0, limit - self._window_count(self.sends, now, window)) if limit else None
+            return result
+
+    def acquire(self, cancel_token):
+        """Wait until a send is allowed. Returns False with exhausted_reason set
+        when the daily or weekly budget is spent; raises Cancelled on stop."""
+        while True:
+            with self._lock:
+                now = time.time()
+                self._refill(now)
+                ready_at, reason = self._earliest(self.sends, self.tokens, now)
+            if reason:
+                self.exhausted_reason = reason
+                return False
+            if ready_at <= now:
+                self.exhausted_reason = None
+                return True
+            cancel_token.sleep(ready_at - now)
+
+    def record_send(self):
+        """Consume one token and count the send against the budgets"""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if self.refill_rate:
+                self.tokens = max(0.0, self.tokens - 1)
+            self.sends.append(now)
+            cutoff = now - WEEK
+            if self.sends[0] <= cutoff:
+                self.sends = self.sends[bisect.bisect_right(self.sends, cutoff):]
+            self.save()
+
+    def projected_finish(self, remaining_requests, seconds_per_request=0.0):
+        """Project remaining_requests more sends. Returns (finish, sends, frees_at):
+        the estimated wall-clock time the run ends, how many sends it makes and,
+        if a daily or weekly budget will stop it early, when that budget frees up."""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            sends = list(self.sends)
+            tokens = self.tokens
+        capacity = float(self.limits["burst"] or 1)
+        tokens_at = now
+        t = now
+        for _ in range(remaining_requests):
+            # Step forward until every budget and the bucket allow a send at slot
+            slot = t
+            while True:
+                available = min(capacity, tokens + (slot - tokens_at) * self.refill_rate) if self.refill_rate else 1.0
+                ready, reason = self._earliest(sends, available, slot)
+                if reason:
+                    # acquire() stops the run here rather than waiting
+                    return t, len(sends) - len(self.sends), ready
+                if ready <= slot + 1e-6:
+                    break
+                slot = ready
+            if self.refill_rate:
+                tokens, tokens_at = available - 1, slot
+            sends.append(slot)
+            t = slot + seconds_per_request
+        return t, remaining_requests, None
@@ -0,0 +1,157 @@
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
+import time
+
+from checkpoint import page_from_url
+
+END_OF_RESULTS = "end_of_results"
+NO_NEW_CARDS = "no_new_cards"
+MAX_PAGES = "max_pages"
+
+# LinkedIn never serves more than 100 result pages
+DEFAULT_MAX_PAGES = 100
+# A page that keeps re-rendering must still end; ten cards need far fewer passes
+DEFAULT_MAX_SCROLL_PASSES = 50
+
+# Scroll one step and report whether the bottom was reached and what state
+# the pagination "Next" button is in, in a single round trip.
+SCROLL_JS = """
+window.scrollBy(0, arguments[0]);
+var next = document.querySelector('button[aria-label="Next"]');
+return {
+    at_bottom: window.innerHeight + window.scrollY >= document.body.scrollHeight - 2,
+    next: !next ? 'missing' : (next.disabled ? 'disabled' : 'enabled')
+};
+"""
+
+
+def url_for_page(url, page):
+    """Return url with its page query parameter set to page"""
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+class ResultIterator:
+    def __init__(self, driver, waits, discovery, metrics, max_idle_scrolls=2,
+                 max_pages=DEFAULT_MAX_PAGES, scroll_step=900, max_scroll_passes=DEFAULT_MAX_SCROLL_PASSES):
+        """Yield result cards page by page until the results run out"""
+        self.driver = driver
+        self.waits = waits
+        self.discovery = discovery
+        self.metrics = metrics
+        self.max_idle_scrolls = max_idle_scrolls
+        self.max_pages = max_pages
+        self.scroll_step = scroll_step
+        self.max_scroll_passes = max_scroll_passes
+
+        self.page_url = driver.current_url
+        self.page = page_from_url(self.page_url)
+        self.page_stats = []
+        self.stop_reason = None
+        self.on_page_done = None
+        self.on_navigate = None
+        self._stale = False
+        # Cards yielded from the current page, by profile id (or handle)
+        self._page_seen = set()
+
+    def __iter__(self):
+        page_started = time.monotonic()
+        page_cards = 0
+        passes = 0
+        idle = 0
+
+        while True:
+            with self.metrics.span("discover", page=self.page):
+                cards = self.discovery.discover()
+            # A re-render can hand out fresh handles for cards already yielded;
+            # only cards not seen on this page count as progress
+            new_cards = [card for card in cards if self._key(card) not in self._page_seen]
+            page_cards += len(new_cards)
+            for card in new_cards:
+                if self._stale:
+                    # The page was reloaded; these handles no longer exist
+                    break
+                self._page_seen.add(self._key(card))
+                yield card
+            self._stale = False
+
+            with self.metrics.span("scroll_pass", page=self.page):
+                signature = self.waits.results_signature()
+                state = self.driver.execute_script(SCROLL_JS, self.scroll_step) or {}
+                # Once at the bottom of a page that has yielded cards nothing more
+                # will load, and waiting for a change would only run out the timeout
+                if not (state.get("at_bottom") and page_cards):
+                    try:
+                        self.waits.results_changed(signature)
+                    except TimeoutException:
+                        pass
+            passes += 1
+
+            if passes >= self.max_scroll_passes:
+                self.metrics.event("scroll_pass_limit", page=self.page, passes=passes, cards=page_cards)
+            elif new_cards:
+                idle = 0
+                continue
+            else:
+                idle += 1
+                if idle < self.max_idle_scrolls and not state.get("at_bottom"):
+                    continue
+
+            # Nothing new appeared: this page is exhausted
+            self._finish_page(page_cards, time.monotonic() - page_started)
+            if page_cards == 0:
+                self.stop_reason = NO_NEW_CARDS
+                return
+            if state.get("next") != "enabled":
+                self.stop_reason = END_OF_RESULTS
+                return
+            if self.page >= self.max_pages:
+                self.stop_reason = MAX_PAGES
+                return
+
+            self.next_page()
+            page_started = time.monotonic()
+            page_cards = 0
+            passes = 0
+            idle = 0
+
+    def next_page(self):
+        """Load the following results page by URL"""
+        self.page += 1
+        self.page_url = url_for_page(self.page_url, self.page)
+        with self.metrics.span("page_navigation", page=self.page):
+            self.driver.get(self.page_url)
+            self._page_seen.clear()
+            try:
+                self.waits.results_loaded()
+            except TimeoutException:
+                pass
+        if self.on_navigate:
+            self.on_navigate(self.page)
+
+    def reload(self, driver=None, waits=None):
+        """Load the current page again, optionally on a new driver, e.g. after
+        the browser was recycled; cards already handled are skipped by the caller"""
+        if driver is not None:
+            self.driver = driver
+            self.discovery.driver = driver
+        if waits is not None:
+            self.waits = waits
+        self._stale = True
+        self.driver.get(self.page_url)
+        try:
+            self.waits.results_loaded()
+        except TimeoutException:
+            pass
+
+    def _key(self, card):
+        return card.get("profile_id") or card["handle"]
+
+    def _finish_page(self, cards, seconds):
+        stats = {"page": self.page, "cards": cards, "seconds": seconds}
+        self.page_stats.append(stats)
+        self.metrics.record("page", seconds, page=self.page, cards=cards)
+        if self.on_page_done:
+            self.on_page_done(stats)
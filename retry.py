@@ -0,0 +1,180 @@
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, InvalidSessionIdException,
+    NoSuchWindowException, StaleElementReferenceException, TimeoutException,
+)
+from collections import deque
+import random
+import time
+
+from cancellation import Cancelled
+
+# Failure classes
+STALE = "stale_element"
+INTERCEPTED = "click_intercepted"
+MODAL_NOT_OPENED = "modal_not_opened"
+SEND_MISSING = "send_missing"
+SEND_NOT_CONFIRMED = "send_not_confirmed"
+NOTE_FAILED = "note_failed"
+SESSION_LOST = "session_lost"
+UNKNOWN = "unknown"
+
+# How many times each class is retried. A Send that was clicked but never
+# confirmed is not retried, since the invitation may already have gone out.
+RETRY_LIMITS = {
+    STALE: 2,
+    INTERCEPTED: 2,
+    MODAL_NOT_OPENED: 1,
+    SEND_MISSING: 1,
+    SEND_NOT_CONFIRMED: 0,
+    UNKNOWN: 0,
+}
+# Classes that end the run instead of skipping the profile
+FATAL = {SESSION_LOST}
+
+# Override with the "retry" section of linkedin_settings.json
+DEFAULT_RETRY = {
+    "base_delay": 0.5,
+    "max_delay": 4.0,
+    "breaker_window": 10,
+    "breaker_threshold": 0.5,
+    "breaker_min_attempts": 5,
+    "breaker_cooldown": 300,
+    "breaker_max_trips": 3,
+}
+
+
+class StepTimeout(TimeoutException):
+    def __init__(self, step, cause=None):
+        """A wait inside the connect flow timed out; step says which one"""
+        super().__init__(f"timed out waiting for {step}")
+        self.step = step
+        self.cause = cause
+
+
+class ConnectFailed(Exception):
+    def __init__(self, failure_class, error):
+        """A connect attempt failed for good after any retries"""
+        super().__init__(f"{failure_class}: {error}")
+        self.failure_class = failure_class
+        self.error = error
+
+
+STEP_CLASSES = {
+    "modal_open": MODAL_NOT_OPENED,
+    "send_enabled": SEND_MISSING,
+    "modal_closed": SEND_NOT_CONFIRMED,
+}
+
+
+def classify(error):
+    """Map an exception raised during a connect attempt to a failure class"""
+    if isinstance(error, StepTimeout):
+        return STEP_CLASSES.get(error.step, UNKNOWN)
+    if isinstance(error, StaleElementReferenceException):
+        return STALE
+    if isinstance(error, (ElementClickInterceptedException, ElementNotInteractableException)):
+        return INTERCEPTED
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return SESSION_LOST
+    return UNKNOWN
+
+
+class RetryEngine:
+    def __init__(self, cancel_token, base_delay=0.5, max_delay=4.0, limits=None, seed=None):
+        """Retry connect attempts by failure class with bounded, jittered backoff"""
+        self.cancel_token = cancel_token
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limits = dict(RETRY_LIMITS)
+        self.limits.update(limits or {})
+        self.random = random.Random(seed)
+        self.stats = {}
+
+    def _entry(self, failure_class):
+        return self.stats.setdefault(failure_class, {"failures": 0, "retries": 0, "recovered": 0, "seconds_lost": 0.0})
+
+    def backoff(self, attempt):
+        """Delay before retry number attempt (1-based): exponential, capped, with jitter"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (0.5 + self.random.random() / 2)
+
+    def run(self, action, recover):
+        """Call action() until it succeeds or its failure class runs out of retries.
+
+        recover(failure_class) is called after every failure to put the page
+        back into a known state. Raises ConnectFailed, or the original error
+        for fatal classes; Cancelled always propagates.
+        """
+        started = None
+        classes = []
+        attempt = 0
+        while True:
+            attempt_started = time.monotonic()
+            try:
+                result = action()
+            except Cancelled:
+                raise
+            except Exception as e:
+                failure_class = classify(e)
+                if started is None:
+                    # Time lost includes the failed attempt itself, e.g. a wait that ran out
+                    started = attempt_started
+                classes.append(failure_class)
+                self._entry(failure_class)["failures"] += 1
+                if failure_class in FATAL:
+                    self._entry(failure_class)["seconds_lost"] += time.monotonic() - started
+                    raise
+                recover(failure_class)
+                if attempt >= self.limits.get(failure_class, 0):
+                    self._entry(failure_class)["seconds_lost"] += time.monotonic() - started
+                    raise ConnectFailed(failure_class, e) from e
+                attempt += 1
+                self._entry(failure_class)["retries"] += 1
+                self.cancel_token.sleep(self.backoff(attempt))
+                continue
+
+            if started is not None:
+                # Charge the time lost to the class that caused the first failure
+                self._entry(classes[-1])["recovered"] += 1
+                self._entry(classes[0])["seconds_lost"] += time.monotonic() - started
+            return result
+
+    def record(self, failure_class, seconds, recovered=True):
+        """Count a failure that was handled elsewhere, e.g. a note that could not be added"""
+        entry = self._entry(failure_class)
+        entry["failures"] += 1
+        entry["seconds_lost"] += seconds
+        if recovered:
+            entry["recovered"] += 1
+
+    def summary(self):
+        return {failure_class: dict(entry) for failure_class, entry in self.stats.items()}
+
+
+class CircuitBreaker:
+    def __init__(self, window=10, threshold=0.5, min_attempts=5, max_trips=3):
+        """Trip when more than threshold of the last window attempts failed"""
+        self.outcomes = deque(maxlen=window)
+        self.threshold = threshold
+        self.min_attempts = min_attempts
+        self.max_trips = max_trips
+        self.trips = 0
+        self.tripped_rate = 0.0
+
+    def record(self, ok):
+        """Record one attempt; returns True when the breaker trips"""
+        self.outcomes.append(bool(ok))
+        if len(self.outcomes) < self.min_attempts:
+            return False
+        failures = self.outcomes.count(False)
+        if failures / len(self.outcomes) > self.threshold:
+            self.trips += 1
+            self.tripped_rate = failures / len(self.outcomes)
+            self.outcomes.clear()
+            return True
+        return False
+
+    @property
+    def exhausted(self):
+        """True once the breaker has tripped more often than allowed in one run"""
+        return self.trips > self.max_trips
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the LinkedIn Automation Tool.
+Reports which imports the window waits for (from -X importtime) and the
+cold and warm time from process start to the first painted window.
+Cold runs use an empty bytecode cache; warm runs reuse it.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from main import STARTUP_PROBE_ENV
+
+RESULTS_DIR = "bench_results"
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module, env=None):
+    """Run `python -X importtime -c 'import module'` and return {module: (self_us, cumulative_us)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR, env=env, capture_output=True, text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        except ValueError:
+            continue
+        if name.strip() == "site":
+            # Everything up to here is interpreter startup, not the app
+            times = {}
+            continue
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def time_to_first_paint(env):
+    """Seconds from spawning main.py until it reports a painted window, or None"""
+    env = dict(env)
+    env[STARTUP_PROBE_ENV] = "1"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(APP_DIR, "main.py")],
+        cwd=APP_DIR, env=env, stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    for line in proc.stdout:
+        if line.strip() == "FIRST_PAINT":
+            elapsed = time.perf_counter() - start
+            proc.wait()
+            return elapsed
+    proc.wait()
+    return None
+
+
+def print_import_report(module, times, top):
+    total = max((cumulative for _, cumulative in times.values()), default=0)
+    print(f"Imports for '{module}': {len(times)} modules, {total / 1000:.1f} ms cumulative")
+    ranked = sorted(times.items(), key=lambda item: -item[1][1])[:top]
+    for name, (self_us, cumulative_us) in ranked:
+        print(f"  {name:<45}{self_us / 1000:>9.1f} ms self{cumulative_us / 1000:>9.1f} ms total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application startup")
+    parser.add_argument("--runs", type=int, default=3, help="warm runs after the cold one")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    gui_imports = import_times("gui")
+    bot_imports = import_times("linkedin_bot")
+    print_import_report("gui (before first paint)", gui_imports, args.top)
+    print_import_report("linkedin_bot (loaded in background)", bot_imports, args.top)
+
+    # A private, empty bytecode cache makes the first run cold and the rest warm
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=tempfile.mkdtemp(prefix="linkedin-pycache-"))
+    cold = time_to_first_paint(env)
+    warm = [time_to_first_paint(env) for _ in range(args.runs)]
+    warm = [w for w in warm if w is not None]
+
+    if cold is None:
+        print("Could not measure first paint (no display available?)")
+    else:
+        print(f"Cold start to first paint: {cold * 1000:.0f} ms")
+    if warm:
+        print(f"Warm start to first paint: {min(warm) * 1000:.0f} ms best, "
+              f"{sum(warm) / len(warm) * 1000:.0f} ms mean over {len(warm)} runs")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w") as f:
+            json.dump({
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "cold_first_paint_s": cold,
+                "warm_first_paint_s": warm,
+                "gui_import_ms": max((c for _, c in gui_imports.values()), default=0) / 1000,
+                "bot_import_ms": max((c for _, c in bot_imports.values()), default=0) / 1000,
+                "gui_modules": sorted(gui_imports),
+            }, f, indent=2)
+        print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
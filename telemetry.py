@@ -0,0 +1,103 @@
+import logging
+
+# Performance.getMetrics values worth keeping. The *Duration values are
+# cumulative for the tab, so samples carry the delta since the previous one.
+CDP_GAUGES = {
+    "JSHeapUsedSize": "js_heap_used_mb",
+    "JSHeapTotalSize": "js_heap_total_mb",
+    "Nodes": "dom_nodes",
+    "Documents": "documents",
+    "JSEventListeners": "event_listeners",
+}
+CDP_DURATIONS = {
+    "TaskDuration": "task_s",
+    "ScriptDuration": "script_s",
+    "LayoutDuration": "layout_s",
+    "RecalcStyleDuration": "style_s",
+}
+MAX_BUFFERED_LONG_TASKS = 1000
+
+# Installed on every new document: buffer long-task durations until the
+# next sample drains them
+LONG_TASK_OBSERVER_JS = """
+(function () {
+    if (window.__botLongTasks) { return; }
+    window.__botLongTasks = [];
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (entry) {
+                if (window.__botLongTasks.length < %d) { window.__botLongTasks.push(entry.duration); }
+            });
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+})();
+""" % MAX_BUFFERED_LONG_TASKS
+
+# Drain the long-task buffer and read navigation timing in one round trip
+PAGE_SAMPLE_JS = """
+var tasks = window.__botLongTasks || [];
+window.__botLongTasks = [];
+var total = 0, longest = 0;
+tasks.forEach(function (d) { total += d; if (d > longest) { longest = d; } });
+var out = {long_tasks: tasks.length, long_task_ms: total, long_task_max_ms: longest};
+var nav = performance.getEntriesByType('navigation')[0];
+if (arguments[0] && nav) {
+    out.ttfb_ms = nav.responseStart;
+    out.dom_content_loaded_ms = nav.domContentLoadedEventEnd;
+    out.load_ms = nav.loadEventEnd;
+    out.transfer_kb = nav.transferSize / 1024;
+}
+return out;
+"""
+
+
+class PageTelemetry:
+    def __init__(self, driver):
+        """Sample Chrome DevTools performance data for the current tab"""
+        self.driver = driver
+        self.logger = logging.getLogger("telemetry")
+        self.enabled = False
+        self._previous = {}
+
+    def enable(self):
+        """Turn on the Performance domain and the long-task observer; False if CDP is unavailable"""
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": LONG_TASK_OBSERVER_JS})
+            self.driver.execute_script(LONG_TASK_OBSERVER_JS)
+        except Exception as e:
+            self.logger.warning("Page telemetry unavailable: %s", e)
+            return False
+        self.enabled = True
+        self._previous = {}
+        return True
+
+    def collect(self, navigation=False):
+        """One sample as a flat dict of numbers"""
+        raw = {
+            item["name"]: item["value"]
+            for item in self.driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+        }
+        values = {}
+        for name, key in CDP_GAUGES.items():
+            if name in raw:
+                values[key] = raw[name] / (1024 * 1024) if name.startswith("JSHeap") else raw[name]
+        for name, key in CDP_DURATIONS.items():
+            if name in raw:
+                # A new renderer restarts the counters, so never report a negative delta
+                values[key] = max(0.0, raw[name] - self._previous.get(name, 0.0))
+                self._previous[name] = raw[name]
+        values.update(self.driver.execute_script(PAGE_SAMPLE_JS, navigation) or {})
+        return values
+
+    def sample(self, metrics, label, **attrs):
+        """Record a sample under label ("navigation" or "action") in metrics; never raises"""
+        if not self.enabled:
+            return None
+        try:
+            values = self.collect(navigation=(label == "navigation"))
+        except Exception as e:
+            self.logger.debug("Telemetry sample failed: %s", e)
+            return None
+        metrics.telemetry(label, values, **attrs)
+        return values
@@ -0,0 +1,9 @@
+import logging
+import os
+import sys
+
+# The modules live at the repository root rather than in an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The bot logs every failure it recovers from; keep test output readable
+logging.getLogger("linkedin_bot").setLevel(logging.CRITICAL)
@@ -0,0 +1,267 @@
+"""End-to-end runs of LinkedInBot against fake_driver, without a browser."""
+
+import random
+import threading
+
+from selenium.common.exceptions import TimeoutException
+import pytest
+
+from discovery import CardDiscovery
+from fake_driver import FakeLinkedIn, fake_bot
+from memory_watchdog import RECYCLE_DRIVER
+from retry import SESSION_LOST, classify
+
+EMAIL = "user@example.com"
+PASSWORD = "secret"
+
+
+def logged_in_bot(site, **overrides):
+    bot = fake_bot(site, **overrides)
+    assert bot.initialize_driver()
+    assert bot.start_session(EMAIL, PASSWORD)
+    return bot
+
+
+def stop_after(holder, sends):
+    """Status callback that stops holder[0] once it reports sends requests sent"""
+    def update_status(message):
+        if message.startswith(f"📩 Progress: {sends}/"):
+            holder[0].stop()
+    return update_status
+
+
+def failures(bot):
+    return bot.last_run_summary["info"].get("failures", {})
+
+
+def test_fresh_login_then_reused_session(tmp_path):
+    site = FakeLinkedIn(email=EMAIL, password=PASSWORD)
+    cookie_file = str(tmp_path / "cookies.json")
+
+    first = logged_in_bot(site, cookie_file=cookie_file)
+    assert not first.session_reused
+    first.close()
+
+    second = fake_bot(site, cookie_file=cookie_file)
+    assert second.initialize_driver()
+    assert second.start_session("", "")
+    assert second.session_reused
+    assert site.drivers_opened == 2
+
+
+def test_no_session_store_needs_credentials():
+    site = FakeLinkedIn(email=EMAIL, password=PASSWORD)
+    bot = fake_bot(site)
+    assert bot.initialize_driver()
+    assert not bot.start_session("", "")
+    assert not bot.start_session(EMAIL, "wrong")
+    assert bot.start_session(EMAIL, PASSWORD)
+    assert not bot.session_reused
+
+
+def test_sends_are_counted_against_the_site():
+    site = FakeLinkedIn(total_results=40, pending_rate=0.2)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 15)
+    assert bot.requests_sent == 15
+    assert len(site.invites) == 15
+    assert not any(site.profiles[i]["pending"] and p["id"] in site.invites
+                   for i, p in enumerate(site.profiles))
+
+
+def test_search_exhausted_before_target():
+    site = FakeLinkedIn(total_results=12)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 50)
+    assert bot.requests_sent == len(site.invites) == 12
+    assert bot.last_run_summary["info"]["stop_reason"] == "end_of_results"
+
+
+def test_note_is_rendered_per_card():
+    site = FakeLinkedIn(total_results=5)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 3, include_note=True, custom_note="Hi {first_name}!")
+    assert site.invites["fake-member-1"] == "Hi Member1!"
+
+
+def test_note_falls_back_to_send_keys():
+    site = FakeLinkedIn(total_results=5, reject_js_note=True)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 3, include_note=True, custom_note="Hello")
+    assert sorted(site.invites.values()) == ["Hello"] * 3
+
+
+def test_failed_note_still_sends_without_it():
+    site = FakeLinkedIn(total_results=5)
+    bot = logged_in_bot(site)
+
+    def no_note_button():
+        raise TimeoutException("add note never appeared")
+    bot.waits.add_note_button = no_note_button
+
+    assert bot.search_and_connect("data engineer", 3, include_note=True, custom_note="Hello")
+    assert sorted(site.invites.values()) == [""] * 3
+    assert failures(bot)["note_failed"]["failures"] == 3
+
+
+def test_card_that_loses_its_button_is_recorded_as_skipped(monkeypatch):
+    click = CardDiscovery.click
+    monkeypatch.setattr(CardDiscovery, "click", lambda self, card: (
+        "no_button" if card["profile_id"] == "fake-member-2" else click(self, card)))
+    site = FakeLinkedIn(total_results=10)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 5)
+    assert bot.contacts.outcomes["fake-member-2"] == "skipped"
+    assert bot.requests_sent == len(site.invites) == 5
+
+
+def test_modal_that_never_opens_is_retried_then_skipped():
+    site = FakeLinkedIn(total_results=10)
+    site.fail_modal_for.add("fake-member-2")
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 5)
+    assert "fake-member-2" not in site.invites
+    assert bot.requests_sent == len(site.invites) == 5
+    stats = failures(bot)["modal_not_opened"]
+    assert stats["failures"] == 2 and stats["retries"] == 1 and stats["recovered"] == 0
+
+
+def test_unconfirmed_send_is_not_retried():
+    site = FakeLinkedIn(total_results=10)
+    site.fail_send_for.add("fake-member-3")
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 5)
+    assert "fake-member-3" not in site.invites
+    assert bot.requests_sent == len(site.invites) == 5
+    assert failures(bot)["send_not_confirmed"] == {
+        "failures": 1, "retries": 0, "recovered": 0, "seconds_lost": pytest.approx(0, abs=1)}
+
+
+def test_stale_elements_and_rerenders_are_recovered():
+    site = FakeLinkedIn(total_results=60, stale_rate=0.2, rerender_rate=0.2, seed=7)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 20, include_note=True)
+    assert bot.requests_sent == len(site.invites) == 20
+
+
+def test_circuit_breaker_stops_a_failing_run():
+    site = FakeLinkedIn(total_results=100, send_failure_rate=1.0)
+    bot = logged_in_bot(site)
+    assert bot.search_and_connect("data engineer", 50)
+    assert bot.requests_sent == len(site.invites) == 0
+    summary = bot.last_run_summary
+    assert summary["info"]["stop_reason"] == "circuit_open"
+    assert summary["events"]["circuit_open"] == 3
+
+
+def test_stop_ends_the_run():
+    holder = []
+    site = FakeLinkedIn(total_results=50)
+    bot = logged_in_bot(site, update_status_callback=stop_after(holder, 4))
+    holder.append(bot)
+    assert bot.search_and_connect("data engineer", 20)
+    assert bot.requests_sent == len(site.invites) == 4
+    assert not bot.is_running
+    assert bot.last_stop_latency is not None
+
+
+def test_resume_continues_from_checkpoint(tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    site = FakeLinkedIn(total_results=50, page_size=5)
+    holder = []
+    first = logged_in_bot(site, checkpoint_file=checkpoint_file, update_status_callback=stop_after(holder, 7))
+    holder.append(first)
+    assert first.search_and_connect("data engineer", 12)
+    assert len(site.invites) == 7
+
+    second = logged_in_bot(site, checkpoint_file=checkpoint_file)
+    assert second.search_and_connect("data engineer", 12, resume=True)
+    assert second.requests_sent == len(site.invites) == 12
+    assert second.requests_restored == 7
+    # Resumed on the page where the first run stopped, not on page 1
+    assert second.last_run_summary["phases"]["page"]["count"] <= 2
+
+
+def test_exhausted_search_is_not_resumed(tmp_path):
+    checkpoint_file = str(tmp_path / "checkpoint.json")
+    site = FakeLinkedIn(total_results=12)
+    bot = logged_in_bot(site, checkpoint_file=checkpoint_file)
+    assert bot.search_and_connect("data engineer", 40)
+    assert bot.requests_sent == 12
+    assert bot.checkpoint.load() is None
+
+
+def test_tab_is_recycled_when_the_heap_grows():
+    site = FakeLinkedIn(total_results=60, heap_growth_mb=50)
+    bot = logged_in_bot(site, memory_limits={"js_heap_mb": 200, "check_every": 1})
+    assert bot.search_and_connect("data engineer", 20)
+    assert bot.requests_sent == len(site.invites) == 20
+    assert bot.last_run_summary["info"]["memory_high_water"]["tab_recycles"] >= 2
+    assert site.drivers_opened == 1
+
+
+def test_driver_is_recycled_with_the_session():
+    site = FakeLinkedIn(total_results=30)
+    bot = logged_in_bot(site)
+    checks = iter([None, None, (RECYCLE_DRIVER, 2000.0, None)])
+    bot.watchdog.check = lambda driver: next(checks, None)
+    assert bot.search_and_connect("data engineer", 10)
+    assert bot.requests_sent == len(site.invites) == 10
+    assert site.drivers_opened == 2
+    assert bot.last_run_summary["info"]["memory_high_water"]["driver_recycles"] == 1
+
+
+def test_quit_driver_raises_session_lost():
+    driver = FakeLinkedIn().driver_factory()
+    driver.quit()
+    with pytest.raises(Exception) as raised:
+        driver.get("/feed/")
+    assert classify(raised.value) == SESSION_LOST
+
+
+def test_dry_run_never_clicks(tmp_path):
+    site = FakeLinkedIn(total_results=25, pending_rate=0.2)
+    bot = logged_in_bot(site)
+    export = tmp_path / "cards.jsonl"
+    assert bot.dry_run("data engineer", str(export))
+    assert site.invites == {}
+    assert len(export.read_text().splitlines()) == 25
+    report = bot.last_dry_run
+    assert report["pages"] == 3
+    assert report["candidates"] + report["pending"] == 25
+
+
+def random_site(rng, seed):
+    return FakeLinkedIn(
+        total_results=rng.randint(0, 60),
+        page_size=rng.choice([5, 10]),
+        batch_size=rng.randint(1, 6),
+        pending_rate=rng.random() * 0.3,
+        modal_failure_rate=rng.random() * 0.2,
+        send_failure_rate=rng.random() * 0.1,
+        rerender_rate=rng.random() * 0.2,
+        reject_js_note=rng.random() < 0.3,
+        seed=seed,
+    )
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_randomized_runs_terminate_and_count_every_send(seed):
+    rng = random.Random(seed)
+    site = random_site(rng, seed)
+    bot = logged_in_bot(site)
+    # Only the search is under test; login does not retry stale elements
+    site.stale_rate = rng.random() * 0.2
+    num_requests = rng.randint(1, 40)
+
+    run = threading.Thread(target=bot.search_and_connect, args=("data engineer", num_requests),
+                           kwargs={"include_note": rng.random() < 0.5}, daemon=True)
+    run.start()
+    run.join(timeout=10)
+    if run.is_alive():
+        bot.stop()
+        run.join(timeout=5)
+        pytest.fail(f"run did not finish (seed {seed})")
+
+    assert bot.requests_sent == len(site.invites)
+    assert bot.requests_sent <= num_requests
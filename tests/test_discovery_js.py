@@ -0,0 +1,53 @@
+"""Runs the discovery scripts under Node against a minimal DOM stub."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from discovery import RESTAMP_JS
+
+NODE = shutil.which("node")
+pytestmark = pytest.mark.skipif(NODE is None, reason="needs node to run page scripts")
+
+# Each link sits in its own card; the script's return value and the handle
+# stamped on every card are printed as JSON.
+HARNESS = """
+var hrefs = %(hrefs)s;
+var cards = hrefs.map(function () { return {attrs: {}, setAttribute: function (k, v) { this.attrs[k] = v; }}; });
+var links = hrefs.map(function (href, i) {
+    return {getAttribute: function () { return href; }, closest: function () { return cards[i]; }};
+});
+var document = {querySelectorAll: function () { return links; }};
+var result = (function () { %(script)s }).apply(null, %(args)s);
+console.log(JSON.stringify({result: result, handles: cards.map(function (c) { return c.attrs['data-bot-handle'] || null; })}));
+"""
+
+
+def restamp(hrefs, profile_id, handle="7"):
+    source = HARNESS % {
+        "hrefs": json.dumps(hrefs),
+        "script": RESTAMP_JS,
+        "args": json.dumps([profile_id, handle, "li.reusable-search__result-container"]),
+    }
+    out = subprocess.run([NODE, "-e", source], capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def test_restamp_requires_an_exact_id():
+    found = restamp(["/in/john-smith-4a5b6/", "/in/john-smith/?mini=true"], "john-smith")
+    assert found == {"result": True, "handles": [None, "7"]}
+
+
+def test_restamp_does_not_match_a_longer_id_alone():
+    assert restamp(["/in/john-smith-4a5b6/"], "john-smith") == {"result": False, "handles": [None]}
+
+
+def test_restamp_matches_percent_encoded_ids():
+    found = restamp(["/in/j%C3%BCrgen-m%C3%BCller/"], "jürgen-müller")
+    assert found["handles"] == ["7"]
+
+
+def test_restamp_tolerates_quotes_in_the_id():
+    assert restamp(['/in/o%22brien/'], 'o"brien')["result"] is True
@@ -0,0 +1,121 @@
+from collections import deque
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from metrics import percentile
+
+LAG_TICK_MS = 50
+BLOCK_THRESHOLD_S = 0.25
+MAX_LAG_SAMPLES = 12000  # ten minutes at one tick every 50ms
+MAX_BLOCKS = 50
+
+
+class EventLoopMonitor:
+    def __init__(self, root, tick_ms=LAG_TICK_MS, block_threshold=BLOCK_THRESHOLD_S, on_block=None):
+        """Measure Tk event-loop lag and capture the main thread's stack when it blocks.
+
+        A Tk timer asks to run every tick_ms; how late it actually runs is the
+        lag. A watchdog thread notices when the timer has not run for longer
+        than block_threshold and records where the main thread is stuck.
+        on_block(block) is called on the Tk thread once a block ends.
+        """
+        self.root = root
+        self.tick_ms = tick_ms
+        self.block_threshold = block_threshold
+        self.on_block = on_block
+        self.main_ident = threading.main_thread().ident
+        self.lags = deque(maxlen=MAX_LAG_SAMPLES)
+        self.blocks = deque(maxlen=MAX_BLOCKS)
+        # Only collected between begin_window() and export(), e.g. during a run
+        self.window_lags = None
+        self.window_blocks = None
+        self.logger = logging.getLogger("gui")
+        self._last_beat = time.monotonic()
+        self._pending_stack = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self._last_beat = time.monotonic()
+        self.root.after(self.tick_ms, self._tick)
+        threading.Thread(target=self._watch, name="ui-lag-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _tick(self):
+        now = time.monotonic()
+        lag = max(0.0, now - self._last_beat - self.tick_ms / 1000.0)
+        self._last_beat = now
+        self.lags.append(lag)
+        if self.window_lags is not None:
+            self.window_lags.append(lag)
+
+        stack, self._pending_stack = self._pending_stack, None
+        if stack is not None:
+            block = {
+                "time": time.time(),
+                "seconds": lag,
+                "where": self._where(stack),
+                "stack": "".join(traceback.format_list(stack)),
+            }
+            self.blocks.append(block)
+            if self.window_blocks is not None:
+                self.window_blocks.append(block)
+            self.logger.warning("Tk main thread blocked for %.0f ms in %s\n%s", lag * 1000, block["where"],
+                                block["stack"], extra={"phase": "ui_block", "seconds": lag})
+            if self.on_block:
+                self.on_block(block)
+
+        if not self._stop.is_set():
+            self.root.after(self.tick_ms, self._tick)
+
+    def _watch(self):
+        interval = self.block_threshold / 4
+        while not self._stop.wait(interval):
+            overdue = time.monotonic() - self._last_beat - self.tick_ms / 1000.0
+            if overdue >= self.block_threshold and self._pending_stack is None:
+                frame = sys._current_frames().get(self.main_ident)
+                if frame is not None:
+                    self._pending_stack = traceback.extract_stack(frame)
+
+    def _where(self, stack):
+        """The innermost frame in this project's code, e.g. "save_settings (gui.py:480)" """
+        here = os.path.dirname(os.path.abspath(__file__))
+        frames = [frame for frame in stack if os.path.abspath(frame.filename).startswith(here)] or list(stack)
+        if not frames:
+            return "unknown"
+        frame = frames[-1]
+        return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+
+    def stats(self, lags=None, blocks=None):
+        """Lag percentiles in milliseconds and the number of blocks"""
+        lags = list(self.lags if lags is None else lags)
+        blocks = self.blocks if blocks is None else blocks
+        return {
+            "ticks": len(lags),
+            "p50_ms": percentile(lags, 50) * 1000,
+            "p95_ms": percentile(lags, 95) * 1000,
+            "p99_ms": percentile(lags, 99) * 1000,
+            "max_ms": max(lags, default=0.0) * 1000,
+            "blocks": len(blocks),
+        }
+
+    def begin_window(self):
+        """Start collecting a separate set of samples, e.g. for one run"""
+        self.window_lags = deque(maxlen=MAX_LAG_SAMPLES)
+        self.window_blocks = deque(maxlen=MAX_BLOCKS)
+
+    def export(self, metrics):
+        """Attach this window's lag statistics and blocks to a run's metrics and end the window"""
+        lags, blocks = self.window_lags, self.window_blocks
+        self.window_lags = None
+        self.window_blocks = None
+        if lags is None:
+            return
+        metrics.set_info("ui_lag", self.stats(lags, blocks))
+        for block in list(blocks):
+            metrics.record("ui_block", block["seconds"], start=block["time"] - block["seconds"], where=block["where"])
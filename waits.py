@@ -0,0 +1,154 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from collections import deque
+import time
+
+import locators
+
+# Per-step timeouts in seconds. Override any of them through the
+# "timeouts" section of linkedin_settings.json.
+# Most recent durations kept per step; counts and totals cover every wait
+MAX_WAIT_SAMPLES = 1000
+
+DEFAULT_TIMEOUTS = {
+    "login_form": 10,
+    "nav_rendered": 15,
+    "session_check": 8,
+    "search_box": 10,
+    "people_tab": 10,
+    "results_loaded": 10,
+    "results_changed": 5,
+    "modal_open": 5,
+    "add_note": 5,
+    "note_field": 5,
+    "send_enabled": 5,
+    "modal_closed": 5,
+}
+
+# Cheap fingerprint of the results list: number of cards, number of
+# Connect buttons and the page height. Any lazy-loaded batch changes it.
+RESULTS_SIGNATURE_JS = """
+var cards = document.querySelectorAll(arguments[0]).length;
+var buttons = 0;
+document.querySelectorAll('button').forEach(function (b) {
+    if (b.innerText.indexOf('Connect') !== -1) { buttons++; }
+});
+return cards + ':' + buttons + ':' + document.body.scrollHeight;
+"""
+
+
+class WaitEngine:
+    def __init__(self, driver, timeouts=None, poll_frequency=0.1, cancel_token=None):
+        """Wait on explicit DOM conditions and record how long each wait took"""
+        self.driver = driver
+        self.poll_frequency = poll_frequency
+        self.cancel_token = cancel_token
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+        self.timings = {}
+
+    def until(self, step, condition, timeout=None):
+        """Wait for condition, recording the elapsed time under step.
+
+        The cancel token is checked before every poll, so a stop interrupts
+        the wait within one poll interval by raising Cancelled.
+        """
+        if timeout is None:
+            timeout = self.timeouts.get(step, 10)
+
+        def guarded(driver):
+            if self.cancel_token:
+                self.cancel_token.check()
+            return condition(driver)
+
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(guarded)
+        except TimeoutException:
+            self._record(step, time.monotonic() - start, timed_out=True)
+            raise
+        self._record(step, time.monotonic() - start)
+        return result
+
+    def _record(self, step, elapsed, timed_out=False):
+        entry = self.timings.get(step)
+        if entry is None:
+            entry = self.timings[step] = {"count": 0, "timeouts": 0, "total": 0.0, "max": 0.0,
+                                          "samples": deque(maxlen=MAX_WAIT_SAMPLES)}
+        entry["count"] += 1
+        entry["samples"].append(elapsed)
+        entry["total"] += elapsed
+        entry["max"] = max(entry["max"], elapsed)
+        if timed_out:
+            entry["timeouts"] += 1
+
+    # Named conditions used by LinkedInBot
+
+    def login_form(self):
+        return self.until("login_form", EC.presence_of_element_located(locators.USERNAME_FIELD))
+
+    def nav_rendered(self):
+        return self.until("nav_rendered", EC.presence_of_element_located(locators.GLOBAL_NAV))
+
+    def session_state(self):
+        """Return "valid" once the nav renders or "invalid" if sent to a login wall"""
+        def check(driver):
+            if driver.find_elements(*locators.GLOBAL_NAV):
+                return "valid"
+            url = driver.current_url
+            if "/login" in url or "authwall" in url or "/checkpoint" in url:
+                return "invalid"
+            return False
+
+        try:
+            return self.until("session_check", check)
+        except TimeoutException:
+            return "invalid"
+
+    def search_box(self):
+        return self.until("search_box", EC.presence_of_element_located(locators.SEARCH_BOX))
+
+    def people_tab(self):
+        return self.until("people_tab", EC.element_to_be_clickable(locators.PEOPLE_TAB))
+
+    def results_loaded(self):
+        return self.until("results_loaded", EC.any_of(
+            EC.presence_of_element_located(locators.RESULT_CARD),
+            EC.presence_of_element_located(locators.CONNECT_BUTTON),
+        ))
+
+    def modal_open(self):
+        return self.until("modal_open", EC.visibility_of_element_located(locators.MODAL))
+
+    def add_note_button(self):
+        return self.until("add_note", EC.element_to_be_clickable(locators.ADD_NOTE_BUTTON))
+
+    def note_field(self):
+        return self.until("note_field", EC.presence_of_element_located(locators.NOTE_FIELD))
+
+    def send_enabled(self):
+        return self.until("send_enabled", EC.element_to_be_clickable(locators.SEND_BUTTON))
+
+    def modal_closed(self):
+        return self.until("modal_closed", EC.invisibility_of_element_located(locators.MODAL))
+
+    def results_signature(self):
+        """Return a fingerprint of the current results list"""
+        return self.driver.execute_script(RESULTS_SIGNATURE_JS, locators.RESULT_CARD[1])
+
+    def results_changed(self, previous_signature):
+        """Wait until the results list differs from previous_signature"""
+        return self.until("results_changed", lambda d: self.results_signature() != previous_signature)
+
+    def summary(self):
+        """Return per-step wait statistics (count, timeouts, mean, max in seconds)"""
+        return {
+            step: {
+                "count": entry["count"],
+                "timeouts": entry["timeouts"],
+                "mean": entry["total"] / entry["count"] if entry["count"] else 0.0,
+                "max": entry["max"],
+            }
+            for step, entry in self.timings.items()
+        }